@@ -1,52 +1,66 @@
 """
 FastAPI Backend for Smart AI Interviewer
 """
-from fastapi import FastAPI, Depends, HTTPException, Header, UploadFile, File as FastAPIFile, Request
+from fastapi import FastAPI, Depends, HTTPException, Header, UploadFile, File as FastAPIFile, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
-from sqlalchemy.orm import Session
-from typing import Optional
-from datetime import datetime
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import func
+from sqlalchemy.orm import Session, raiseload
+from typing import NamedTuple, Optional
+from uuid import UUID
 import os
+import time
+import uuid
+import asyncio
+import hashlib
+import shutil
 import jwt
+import orjson
 import aiofiles
 import uvicorn
 import fitz  # PyMuPDF
+from cachetools import TTLCache
 from pathlib import Path
 from dotenv import load_dotenv
 from pydantic import BaseModel
 
-from src.db.config import get_db, init_db
-from src.db.models import User, Interview, InterviewSession, InterviewMemory
-from src.memory.extractor import (
-    extract_text_from_pdf,
-    extract_text_from_txt,
-    extract_cv_details,
-    extract_jd_details,
-    generate_cv_summary,
-    generate_jd_summary
+from src.db.config import get_db, init_db, SessionLocal
+from src.db.models import User, Interview, InterviewSession, InterviewMemory, utcnow
+from src.memory.processor import (
+    STATUS_PENDING,
+    set_processing_status,
+    get_processing_status_row,
+    process_cv,
+    process_jd_file,
+    process_jd_from_text
 )
+from src.memory.extractor import get_pdf_page_count, MAX_PAGES_CV, MAX_PAGES_JD
 from src.agents import CoordinatorAgent
 from src.memory.loader import get_recent_sessions
+from src.utils.logger import logger
 
 load_dotenv()
 
-app = FastAPI(title="Smart AI Interviewer API", version="1.0.0")
-
-# CORS middleware - Fixed to handle OPTIONS requests properly
+# ORJSONResponse: orjson encodes datetimes/UUIDs natively and is several times faster than stdlib json
+app = FastAPI(title="Smart AI Interviewer API", version="1.0.0", default_response_class=ORJSONResponse)
+
+# Allowed CORS origins - frozenset for O(1) origin checks
+ALLOWED_ORIGINS = frozenset({
+    "http://localhost:5173",
+    "http://localhost:3000",
+    "http://localhost:8080",
+    "http://127.0.0.1:5173",
+    "http://127.0.0.1:8080",
+    "https://smart-ai-interviewer-sai.vercel.app",
+})
+CORS_ALLOW_METHODS = ("GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH")
+
+# CORS middleware - handles OPTIONS preflight and CORS headers for all routes
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5173",
-        "http://localhost:3000",
-        "http://localhost:8080",
-        "http://127.0.0.1:5173",
-        "http://127.0.0.1:8080",
-        "https://smart-ai-interviewer-sai.vercel.app",
-        "https://smart-ai-interviewer-sai.vercel.app/",
-    ],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
+    allow_methods=CORS_ALLOW_METHODS,
     allow_headers=["*"],
     expose_headers=["*"],
     max_age=3600,
@@ -56,6 +70,10 @@ app.add_middleware(
 CLERK_SECRET_KEY = os.getenv("CLERK_SECRET_KEY")
 CLERK_PUBLISHABLE_KEY = os.getenv("CLERK_PUBLISHABLE_KEY")
 
+# Decoded token cache - keyed by token hash, entries never outlive the JWT's exp
+TOKEN_CACHE_TTL_SECONDS = 30
+_token_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL_SECONDS)
+
 # Create uploads directory if it doesn't exist
 UPLOADS_DIR = Path("uploads")
 UPLOADS_DIR.mkdir(exist_ok=True)
@@ -64,23 +82,77 @@ JD_DIR = UPLOADS_DIR / "jd"
 CV_DIR.mkdir(exist_ok=True)
 JD_DIR.mkdir(exist_ok=True)
 
+# Characters of JD/CV summary shown per interview in the list view
+LIST_PREVIEW_CHARS = 100
+
+# Maximum accepted PDF upload size
+MAX_PDF_BYTES = int(os.getenv("MAX_PDF_BYTES", str(10 * 1024 * 1024)))
+
+# How long /start waits for background CV/JD processing before opening without it
+PROCESSING_WAIT_SECONDS = float(os.getenv("PROCESSING_WAIT_SECONDS", "60"))
+PROCESSING_POLL_SECONDS = 0.5
+
+
+async def read_pdf_upload(file: UploadFile) -> bytes:
+    """
+    Validate and read an uploaded PDF
+    Rejects non-PDF content (magic bytes) and oversized files before any disk or LLM work
+    """
+    if not file.filename.endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+    
+    if file.size and file.size > MAX_PDF_BYTES:
+        raise HTTPException(status_code=413, detail=f"PDF must be at most {MAX_PDF_BYTES // (1024 * 1024)} MB")
+    
+    header = await file.read(1024)
+    if not header.startswith(b"%PDF-"):
+        raise HTTPException(status_code=400, detail="File is not a valid PDF")
+    await file.seek(0)
+    
+    content = await file.read()
+    # file.size isn't always known up front - check the actual length too
+    if len(content) > MAX_PDF_BYTES:
+        raise HTTPException(status_code=413, detail=f"PDF must be at most {MAX_PDF_BYTES // (1024 * 1024)} MB")
+    
+    return content
+
+
+def reset_upload_dir(base_dir: Path, interview_id: UUID) -> Path:
+    """
+    Clear and recreate an interview's upload directory (uploads/<type>/<interview_id>/)
+    One directory per interview keeps cleanup O(1) instead of scanning every upload
+    """
+    interview_dir = base_dir / str(interview_id)
+    shutil.rmtree(interview_dir, ignore_errors=True)
+    interview_dir.mkdir(parents=True, exist_ok=True)
+    return interview_dir
+
+
+def remove_upload_dirs(interview_id: UUID):
+    """Delete all uploaded CV/JD files for an interview"""
+    shutil.rmtree(CV_DIR / str(interview_id), ignore_errors=True)
+    shutil.rmtree(JD_DIR / str(interview_id), ignore_errors=True)
 
-# Text extraction and LLM processing functions are in src.memory.extractor
+
+def list_upload_files(base_dir: Path, interview_id: UUID) -> list:
+    """List file names in an interview's upload directory"""
+    interview_dir = base_dir / str(interview_id)
+    if not interview_dir.is_dir():
+        return []
+    return [f.name for f in interview_dir.iterdir()]
 
 
-# AI processing functions are now in src.memory.extractor
+# Text extraction and LLM processing functions are in src.memory.extractor
+# Uploads are processed in the background by src.memory.processor
 
 
-def verify_clerk_token(request: Request, authorization: Optional[str] = Header(None)):
+async def verify_clerk_token(authorization: Optional[str] = Header(None)) -> dict:
     """
     Verify Clerk JWT token and extract user information
     Returns: dict with 'user_id' and 'email'
-    Skips verification for OPTIONS requests (CORS preflight)
+    OPTIONS preflight requests are answered by CORSMiddleware and never reach this
+    Async so FastAPI runs it on the event loop instead of the threadpool (no blocking I/O here)
     """
-    # Skip auth for OPTIONS requests (CORS preflight) - return None to allow CORS middleware to handle it
-    if request.method == "OPTIONS":
-        return None
-    
     # Allow requests without authorization for development (will fail in production)
     if not authorization:
         # For development, allow but return a default user
@@ -94,6 +166,12 @@ def verify_clerk_token(request: Request, authorization: Optional[str] = Header(N
     # Extract token from "Bearer <token>"
     token = authorization.replace("Bearer ", "") if authorization.startswith("Bearer ") else authorization
     
+    # Tokens are reused across many requests - skip decoding if we've seen this one recently
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+    cached = _token_cache.get(cache_key)
+    if cached and cached[0] > time.time():
+        return cached[1]
+    
     try:
         # Decode JWT without verification for now (development mode)
         # In production, verify with Clerk's public key
@@ -110,11 +188,19 @@ def verify_clerk_token(request: Request, authorization: Optional[str] = Header(N
         if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token: missing user_id")
         
-        return {
+        user_info = {
             "user_id": user_id,
             "email": email or f"{user_id}@clerk.user",
             "name": decoded.get("name") or decoded.get("first_name")
         }
+        
+        # Cache until the shorter of the cache TTL and the token's own expiry
+        expires_at = time.time() + TOKEN_CACHE_TTL_SECONDS
+        if decoded.get("exp"):
+            expires_at = min(expires_at, float(decoded["exp"]))
+        _token_cache[cache_key] = (expires_at, user_info)
+        
+        return user_info
     except jwt.DecodeError:
         # If JWT decode fails, treat token as user_id (fallback for development)
         # This allows testing without proper JWT tokens
@@ -127,68 +213,94 @@ def verify_clerk_token(request: Request, authorization: Optional[str] = Header(N
         raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
 
 
-@app.middleware("http")
-async def handle_cors_and_options(request: Request, call_next):
-    """Handle OPTIONS requests and ensure CORS headers on all responses"""
-    # Handle OPTIONS preflight
-    if request.method == "OPTIONS":
-        response = Response()
-        origin = request.headers.get("origin")
-        # allowed_origins = [
-        #     "http://localhost:5173",
-        #     "http://localhost:3000",
-        #     "http://localhost:8080",
-        #     "http://127.0.0.1:5173",
-        #     "http://127.0.0.1:8080",
-        # ]
-        allowed_origins = ["https://smart-ai-interviewer-sai.vercel.app", "https://smart-ai-interviewer-sai.vercel.app/"]
-        if origin in allowed_origins:
-            response.headers["Access-Control-Allow-Origin"] = origin
-        response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS, PATCH"
-        response.headers["Access-Control-Allow-Headers"] = "*"
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-        response.headers["Access-Control-Max-Age"] = "3600"
-        return response
-    
-    # Process request
-    try:
-        response = await call_next(request)
-    except Exception as e:
-        # Ensure CORS headers even on errors
-        import traceback
-        error_detail = str(e)
-        response = Response(
-            content=f'{{"detail": "{error_detail}"}}',
-            status_code=500,
-            media_type="application/json"
-        )
+def get_current_db_user(
+    request: Request,
+    user_info: dict = Depends(verify_clerk_token),
+    db: Session = Depends(get_db)
+) -> Optional[User]:
+    """
+    Load the current user's DB row once per request
+    Cached on request.state so every handler/dependency in the request shares one lookup
+    Returns None if the user doesn't exist yet
+    """
+    if not hasattr(request.state, "user"):
+        request.state.user = db.query(User).filter(User.user_id == user_info["user_id"]).first()
+    return request.state.user
+
+
+def get_coordinator(request: Request) -> CoordinatorAgent:
+    """
+    Shared CoordinatorAgent created at startup (keeps its runner cache warm across requests)
+    Concurrent requests use the same instance - per-turn choices such as the stage model are passed
+    per call (generate_response(model_name=...)), never assigned on the agent
+    """
+    return request.app.state.coordinator
+
+
+def get_owned_interview(db: Session, clerk_user_id: str, interview_id: UUID) -> Interview:
+    """
+    Fetch an interview owned by the given Clerk user in a single JOIN query
+    Raises 404 if the user or interview doesn't exist
+    """
+    # Handlers only serialize columns - raiseload makes any accidental relationship lazy load fail loudly
+    interview = db.query(Interview).options(raiseload("*")).join(User, User.user_id == Interview.user_id).filter(
+        User.user_id == clerk_user_id,
+        Interview.id == interview_id
+    ).first()
     
-    # Add CORS headers to all responses (including errors)
-    origin = request.headers.get("origin")
-    allowed_origins = [
-        "http://localhost:5173",
-        "http://localhost:3000",
-        "http://localhost:8080",
-        "http://127.0.0.1:5173",
-        "http://127.0.0.1:8080",
-        "https://smart-ai-interviewer-sai.vercel.app",
-        "https://smart-ai-interviewer-sai.vercel.app/",
-    ]
-    if origin in allowed_origins:
-        response.headers["Access-Control-Allow-Origin"] = origin
-    response.headers["Access-Control-Allow-Credentials"] = "true"
-    response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS, PATCH"
-    response.headers["Access-Control-Allow-Headers"] = "*"
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
     
-    return response
+    return interview
+
+
+class InterviewRef(NamedTuple):
+    """Lightweight cached view of an owned interview - enough for auth checks and agent calls"""
+    id: UUID
+    user_id: str
+    title: str
+    duration_minutes: int
+
+
+# Interview ownership cache (interview_id -> InterviewRef), invalidated on update/delete
+# Per process: with several uvicorn workers, an update/delete only invalidates the worker that served it,
+# so other workers can serve a stale entry for up to the TTL - write paths pass fresh=True to re-check the DB
+INTERVIEW_REF_TTL_SECONDS = 300
+_interview_ref_cache = TTLCache(maxsize=10000, ttl=INTERVIEW_REF_TTL_SECONDS)
+
+
+async def get_owned_interview_ref(db: Session, clerk_user_id: str, interview_id: UUID, fresh: bool = False) -> InterviewRef:
+    """
+    Like get_owned_interview, but served from an in-process TTL cache (the query on a miss runs in a worker thread)
+    Use for handlers that only need the interview's id/title/duration
+    fresh=True skips the cached entry (and refreshes it) - for handlers that write rows referencing the interview
+    """
+    if fresh:
+        # Dropped first so a 404 below also clears this worker's stale entry
+        _interview_ref_cache.pop(interview_id, None)
+    ref = _interview_ref_cache.get(interview_id)
+    if ref is None:
+        interview = await asyncio.to_thread(get_owned_interview, db, clerk_user_id, interview_id)
+        ref = InterviewRef(interview.id, interview.user_id, interview.title, interview.duration_minutes)
+        _interview_ref_cache[interview_id] = ref
+    elif ref.user_id != clerk_user_id:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    return ref
+
+
+def invalidate_interview_ref(interview_id: UUID):
+    """Drop a cached InterviewRef after the interview is updated or deleted"""
+    _interview_ref_cache.pop(interview_id, None)
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup"""
     init_db()
-    print("Database initialized")
-    print(f"Uploads directory: {UPLOADS_DIR.absolute()}")
+    logger.info("Database initialized")
+    # Agents hold no per-request state (it lives in ADK sessions and call arguments) - share one instance
+    app.state.coordinator = CoordinatorAgent()
+    logger.info("Uploads directory: %s", UPLOADS_DIR.absolute())
 
 
 @app.get("/")
@@ -235,24 +347,17 @@ class UpdateJDRequest(BaseModel):
 
 @app.get("/api/users/me")
 async def get_current_user(
-    request: Request,
-    user_info: Optional[dict] = Depends(verify_clerk_token),
+    user_info: dict = Depends(verify_clerk_token),
+    user: Optional[User] = Depends(get_current_db_user),
     db: Session = Depends(get_db)
 ):
     """
     Get or create current user from Clerk token
     This endpoint is called on dashboard load to ensure user exists in DB
     """
-    # Handle OPTIONS preflight
-    if request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
-    
     clerk_user_id = user_info["user_id"]
     email = user_info["email"]
     
-    # Find user by Clerk user_id
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
-    
     if not user:
         # Create new user with Clerk user_id
         user = User(
@@ -262,12 +367,12 @@ async def get_current_user(
         db.add(user)
         db.commit()
         db.refresh(user)
-        print(f"Created new user: {clerk_user_id} ({email})")
+        logger.info("Created new user: %s (%s)", clerk_user_id, email)
     else:
         # Update email if changed
         if user.email != email:
             user.email = email
-        user.updated_at = datetime.utcnow()
+        user.updated_at = utcnow()
         db.commit()
         db.refresh(user)
     
@@ -276,22 +381,17 @@ async def get_current_user(
 
 @app.post("/api/interviews/create")
 async def create_interview(
-    request: Request,
     data: CreateInterviewRequest,
-    user_info: Optional[dict] = Depends(verify_clerk_token),
+    user_info: dict = Depends(verify_clerk_token),
+    user: Optional[User] = Depends(get_current_db_user),
     db: Session = Depends(get_db)
 ):
     """
     Create a new interview with title, duration, and optional job description
     """
-    # Handle OPTIONS preflight
-    if request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
-    
     clerk_user_id = user_info["user_id"]
     
     # Get or create user
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
     if not user:
         user = User(
             user_id=clerk_user_id,
@@ -319,33 +419,16 @@ async def create_interview(
 
 @app.put("/api/interviews/{interview_id}")
 async def update_interview(
-    request: Request,
-    interview_id: str,
+    interview_id: UUID,
     data: UpdateInterviewRequest,
-    user_info: Optional[dict] = Depends(verify_clerk_token),
+    user_info: dict = Depends(verify_clerk_token),
     db: Session = Depends(get_db)
 ):
     """
     Update interview title and/or duration
     """
-    # Handle OPTIONS preflight
-    if request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
-    
-    clerk_user_id = user_info["user_id"]
-    
     # Verify interview belongs to user
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user.user_id
-    ).first()
-    
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
+    interview = get_owned_interview(db, user_info["user_id"], interview_id)
     
     # Update fields if provided
     if data.title is not None:
@@ -355,537 +438,347 @@ async def update_interview(
     
     db.commit()
     db.refresh(interview)
+    invalidate_interview_ref(interview_id)
     
     return interview.to_dict()
 
 
 @app.delete("/api/interviews/{interview_id}")
 async def delete_interview(
-    request: Request,
-    interview_id: str,
-    user_info: Optional[dict] = Depends(verify_clerk_token),
+    interview_id: UUID,
+    background_tasks: BackgroundTasks,
+    user_info: dict = Depends(verify_clerk_token),
     db: Session = Depends(get_db)
 ):
     """
     Delete an interview and all associated data (sessions, memory, files)
     """
-    # Handle OPTIONS preflight
-    if request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
-    
-    clerk_user_id = user_info["user_id"]
-    
     # Verify interview belongs to user
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    interview = await get_owned_interview_ref(db, user_info["user_id"], interview_id, fresh=True)
     
-    # Convert interview_id to UUID if it's a string
+    # Bulk-delete memory, sessions and the interview (3 statements)
+    # ORM cascade would load every session row and delete them one by one
     try:
-        import uuid as uuid_lib
-        interview_uuid = uuid_lib.UUID(interview_id) if isinstance(interview_id, str) else interview_id
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid interview ID format")
-    
-    interview = db.query(Interview).filter(
-        Interview.id == interview_uuid,
-        Interview.user_id == user.user_id
-    ).first()
-    
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
-    
-    # Delete associated memory first (if exists)
-    try:
-        memory = db.query(InterviewMemory).filter(InterviewMemory.interview_id == interview_uuid).first()
-        if memory:
-            db.delete(memory)
-            db.flush()  # Flush but don't commit yet
-    except Exception as e:
-        print(f"Error deleting memory: {e}")
-        # Continue anyway
-    
-    # Delete associated files from disk
-    try:
-        cv_files = list(CV_DIR.glob(f"{interview_id}_*"))
-        jd_files = list(JD_DIR.glob(f"{interview_id}_*"))
-        for file_path in cv_files + jd_files:
-            try:
-                if file_path.exists():
-                    file_path.unlink()
-            except Exception as e:
-                print(f"Error deleting file {file_path}: {e}")
-    except Exception as e:
-        print(f"Error listing files: {e}")
-    
-    # Delete interview (cascade will delete sessions)
-    try:
-        db.delete(interview)
+        db.query(InterviewMemory).filter(InterviewMemory.interview_id == interview.id).delete(synchronize_session=False)
+        db.query(InterviewSession).filter(InterviewSession.interview_id == interview.id).delete(synchronize_session=False)
+        db.query(Interview).filter(Interview.id == interview.id).delete(synchronize_session=False)
         db.commit()
+        invalidate_interview_ref(interview_id)
     except Exception as e:
         db.rollback()
-        print(f"Error deleting interview: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error deleting interview: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to delete interview: {str(e)}")
     
+    # Delete associated files from disk after the response (runs in the threadpool)
+    background_tasks.add_task(remove_upload_dirs, interview_id)
+    
     return {
         "message": "Interview deleted successfully",
         "interview_id": interview_id
     }
 
 
-@app.post("/api/interviews/{interview_id}/upload-cv")
+@app.post("/api/interviews/{interview_id}/upload-cv", status_code=202)
 async def upload_cv(
-    request: Request,
-    interview_id: str,
+    interview_id: UUID,
+    background_tasks: BackgroundTasks,
     file: UploadFile = FastAPIFile(...),
-    user_info: Optional[dict] = Depends(verify_clerk_token),
+    user_info: dict = Depends(verify_clerk_token),
     db: Session = Depends(get_db)
 ):
-    # Handle OPTIONS preflight
-    if request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
-    
     """
     Upload or update CV PDF for an interview
     If CV already exists, it will be replaced
+    Processing runs in the background - poll /status for completion
     """
-    clerk_user_id = user_info["user_id"]
-    
     # Verify interview belongs to user
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user.user_id
-    ).first()
+    interview = await get_owned_interview_ref(db, user_info["user_id"], interview_id, fresh=True)
     
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
+    # Validate file before touching the existing CV
+    content = await read_pdf_upload(file)
+    page_count = await asyncio.to_thread(get_pdf_page_count, content)
+    if page_count > MAX_PAGES_CV:
+        raise HTTPException(status_code=400, detail=f"CV must be at most {MAX_PAGES_CV} pages")
     
-    # Validate file type
-    if not file.filename.endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
-    
-    # Delete old CV files if they exist
-    try:
-        old_cv_files = list(CV_DIR.glob(f"{interview_id}_*"))
-        for old_file in old_cv_files:
-            try:
-                if old_file.exists():
-                    old_file.unlink()
-            except Exception as e:
-                print(f"Error deleting old CV file {old_file}: {e}")
-    except Exception as e:
-        print(f"Error listing old CV files: {e}")
-    
-    # Save new file
-    file_path = CV_DIR / f"{interview_id}_{file.filename}"
+    # Replace old CV files and save new file
+    file_path = reset_upload_dir(CV_DIR, interview_id) / Path(file.filename).name
     async with aiofiles.open(file_path, 'wb') as f:
-        content = await file.read()
         await f.write(content)
     
-    # Extract text from PDF
-    cv_text = extract_text_from_pdf(str(file_path))
-    
-    if not cv_text:
-        raise HTTPException(status_code=400, detail="Failed to extract text from PDF")
-    
-    print(f"Processing CV for interview {interview_id}...")
-    
-    # Extract structured details using LLM (synchronous functions)
-    cv_summary = generate_cv_summary(cv_text)
-    cv_details = extract_cv_details(cv_text)
-    
-    # Get or create interview memory
-    memory = db.query(InterviewMemory).filter(InterviewMemory.interview_id == interview.id).first()
-    if not memory:
-        memory = InterviewMemory(interview_id=interview.id)
-        db.add(memory)
-    
-    # Update memory with CV information
-    memory.cv_summary = cv_summary
-    memory.cv_details = cv_details
-    memory.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(memory)
-    
-    # Also update interview record with summary for backward compatibility
-    interview.cv_summary = cv_summary
-    db.commit()
-    db.refresh(interview)
+    # Mark CV as pending and hand extraction + LLM processing to the background
+    # The job extracts from the in-memory bytes, so the saved file is never re-read
+    await asyncio.to_thread(set_processing_status, db, interview.id, cv_status=STATUS_PENDING)
+    background_tasks.add_task(process_cv, interview.id, content)
     
     return {
-        "message": "CV uploaded and processed successfully",
+        "message": "CV uploaded, processing started",
         "interview_id": interview_id,
+        "job_id": interview_id,
         "filename": file.filename,
         "file_saved": str(file_path),
-        "text_extracted": len(cv_text) > 0,
-        "summary_length": len(cv_summary) if cv_summary else 0,
-        "details_extracted": cv_details is not None,
-        "summary_preview": cv_summary[:200] + "..." if cv_summary and len(cv_summary) > 200 else cv_summary
+        "status": STATUS_PENDING
     }
 
 
-@app.post("/api/interviews/{interview_id}/upload-jd")
+@app.post("/api/interviews/{interview_id}/upload-jd", status_code=202)
 async def upload_job_description(
-    request: Request,
-    interview_id: str,
+    interview_id: UUID,
+    background_tasks: BackgroundTasks,
     file: UploadFile = FastAPIFile(...),
-    user_info: Optional[dict] = Depends(verify_clerk_token),
+    user_info: dict = Depends(verify_clerk_token),
     db: Session = Depends(get_db)
 ):
-    # Handle OPTIONS preflight
-    if request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
-    
     """
     Upload Job Description PDF for an interview
-    Saves file, extracts text, updates job_description field
+    Saves file, then extracts text and updates job_description field in the background
     """
-    clerk_user_id = user_info["user_id"]
-    
     # Verify interview belongs to user
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user.user_id
-    ).first()
+    interview = await get_owned_interview_ref(db, user_info["user_id"], interview_id, fresh=True)
     
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
+    # Validate file
+    content = await read_pdf_upload(file)
+    page_count = await asyncio.to_thread(get_pdf_page_count, content)
+    if page_count > MAX_PAGES_JD:
+        raise HTTPException(status_code=400, detail=f"Job Description must be at most {MAX_PAGES_JD} pages")
     
-    # Validate file type
-    if not file.filename.endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
-    
-    # Save file
-    file_path = JD_DIR / f"{interview_id}_{file.filename}"
+    # Replace old JD files and save new file
+    file_path = reset_upload_dir(JD_DIR, interview_id) / Path(file.filename).name
     async with aiofiles.open(file_path, 'wb') as f:
-        content = await file.read()
         await f.write(content)
     
-    # Extract text from PDF
-    jd_text = extract_text_from_pdf(str(file_path))
-    
-    if not jd_text:
-        raise HTTPException(status_code=400, detail="Failed to extract text from PDF")
-    
-    print(f"Processing JD for interview {interview_id}...")
-    
-    # Extract structured details using LLM
-    jd_summary = generate_jd_summary(jd_text)
-    jd_details = extract_jd_details(jd_text)
-    
-    # Get or create interview memory
-    memory = db.query(InterviewMemory).filter(InterviewMemory.interview_id == interview.id).first()
-    if not memory:
-        memory = InterviewMemory(interview_id=interview.id)
-        db.add(memory)
-    
-    # Update memory with JD information
-    memory.jd_summary = jd_summary
-    memory.jd_details = jd_details
-    memory.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(memory)
-    
-    # Also update interview record with summary for backward compatibility
-    interview.job_description = jd_summary  # Store summary instead of full text
-    db.commit()
-    db.refresh(interview)
+    # Mark JD as pending and hand extraction + LLM processing to the background
+    # The job extracts from the in-memory bytes, so the saved file is never re-read
+    await asyncio.to_thread(set_processing_status, db, interview.id, jd_status=STATUS_PENDING)
+    background_tasks.add_task(process_jd_file, interview.id, content)
     
     return {
-        "message": "Job Description uploaded and processed successfully",
+        "message": "Job Description uploaded, processing started",
         "interview_id": interview_id,
+        "job_id": interview_id,
         "filename": file.filename,
         "file_saved": str(file_path),
-        "text_extracted": len(jd_text) > 0,
-        "summary_length": len(jd_summary) if jd_summary else 0,
-        "details_extracted": jd_details is not None,
-        "preview": jd_summary[:200] + "..." if jd_summary and len(jd_summary) > 200 else jd_summary
+        "status": STATUS_PENDING
     }
 
 
-@app.post("/api/interviews/{interview_id}/process-jd-text")
+@app.post("/api/interviews/{interview_id}/process-jd-text", status_code=202)
 async def process_jd_text(
-    request: Request,
-    interview_id: str,
+    interview_id: UUID,
     data: ProcessJDTextRequest,
-    user_info: Optional[dict] = Depends(verify_clerk_token),
+    background_tasks: BackgroundTasks,
+    user_info: dict = Depends(verify_clerk_token),
     db: Session = Depends(get_db)
 ):
     """
     Process job description text (from textarea) with AI and save as file
+    AI processing runs in the background - poll /status for completion
     """
-    # Handle OPTIONS preflight
-    if request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
-    
-    clerk_user_id = user_info["user_id"]
-    
     # Verify interview belongs to user
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user.user_id
-    ).first()
-    
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
+    interview = await get_owned_interview_ref(db, user_info["user_id"], interview_id, fresh=True)
     
     if not data.text or not data.text.strip():
         raise HTTPException(status_code=400, detail="Job description text cannot be empty")
     
-    # Delete old JD text files if they exist
-    try:
-        old_jd_files = list(JD_DIR.glob(f"{interview_id}_*"))
-        for old_file in old_jd_files:
-            try:
-                if old_file.exists():
-                    old_file.unlink()
-            except Exception as e:
-                print(f"Error deleting old JD file {old_file}: {e}")
-    except Exception as e:
-        print(f"Error listing old JD files: {e}")
-    
-    # Save text as file
-    file_path = JD_DIR / f"{interview_id}_job_description.txt"
+    # Replace old JD files and save text as file
+    file_path = reset_upload_dir(JD_DIR, interview_id) / "job_description.txt"
     async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
         await f.write(data.text)
     
-    print(f"Processing JD text for interview {interview_id}...")
-    
-    # Extract structured details using LLM
-    jd_summary = generate_jd_summary(data.text)
-    jd_details = extract_jd_details(data.text)
-    
-    # Get or create interview memory
-    memory = db.query(InterviewMemory).filter(InterviewMemory.interview_id == interview.id).first()
-    if not memory:
-        memory = InterviewMemory(interview_id=interview.id)
-        db.add(memory)
+    # Mark JD as pending and hand LLM processing to the background
+    await asyncio.to_thread(set_processing_status, db, interview.id, jd_status=STATUS_PENDING)
+    background_tasks.add_task(process_jd_from_text, interview.id, data.text)
     
-    # Update memory with JD information
-    memory.jd_summary = jd_summary
-    memory.jd_details = jd_details
-    memory.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(memory)
+    return {
+        "message": "Job Description text saved, processing started",
+        "interview_id": interview_id,
+        "job_id": interview_id,
+        "file_saved": str(file_path),
+        "status": STATUS_PENDING
+    }
+
+
+@app.get("/api/interviews/{interview_id}/status")
+async def get_processing_status(
+    interview_id: UUID,
+    user_info: dict = Depends(verify_clerk_token),
+    db: Session = Depends(get_db)
+):
+    """
+    Get background CV/JD processing status for an interview
+    Status values: pending | ready | failed (None if never uploaded)
+    """
+    # Verify interview belongs to user
+    interview = await get_owned_interview_ref(db, user_info["user_id"], interview_id)
     
-    # Also update interview record with summary for backward compatibility
-    interview.job_description = jd_summary
-    db.commit()
-    db.refresh(interview)
+    memory = await asyncio.to_thread(get_processing_status_row, db, interview.id)
     
     return {
-        "message": "Job Description text saved and processed successfully",
         "interview_id": interview_id,
-        "file_saved": str(file_path),
-        "summary_length": len(jd_summary) if jd_summary else 0,
-        "details_extracted": jd_details is not None,
-        "preview": jd_summary[:200] + "..." if jd_summary and len(jd_summary) > 200 else jd_summary
+        "cv_status": memory.cv_status if memory else None,
+        "jd_status": memory.jd_status if memory else None
     }
 
 
 @app.get("/api/interviews")
 async def get_user_interviews(
-    request: Request,
-    user_info: Optional[dict] = Depends(verify_clerk_token),
+    user: Optional[User] = Depends(get_current_db_user),
     db: Session = Depends(get_db)
 ):
-    # Handle OPTIONS preflight
-    if request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
     """
     Get all interviews for the current user
     """
-    clerk_user_id = user_info["user_id"]
-    
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
     if not user:
         return []
     
-    interviews = db.query(Interview).filter(
+    # Project only the list columns - the dashboard shows the first 100 chars of the
+    # JD/CV summaries, so fetch 101 to keep its "..." truncation check working
+    rows = db.query(
+        Interview.id,
+        Interview.user_id,
+        Interview.title,
+        Interview.duration_minutes,
+        func.substr(Interview.job_description, 1, LIST_PREVIEW_CHARS + 1),
+        func.substr(Interview.cv_summary, 1, LIST_PREVIEW_CHARS + 1),
+        Interview.created_at
+    ).filter(
         Interview.user_id == user.user_id  # Use user_id (String)
     ).order_by(Interview.created_at.desc()).all()
     
-    return [interview.to_dict() for interview in interviews]
+    return [
+        {
+            "id": str(interview_id),
+            "user_id": user_id,
+            "title": title,
+            "duration_minutes": duration_minutes,
+            "job_description": job_description,
+            "cv_summary": cv_summary,
+            "created_at": created_at,
+        }
+        for interview_id, user_id, title, duration_minutes, job_description, cv_summary, created_at in rows
+    ]
 
 
 @app.get("/api/interviews/{interview_id}")
 async def get_interview(
-    request: Request,
-    interview_id: str,
-    user_info: Optional[dict] = Depends(verify_clerk_token),
+    interview_id: UUID,
+    user_info: dict = Depends(verify_clerk_token),
     db: Session = Depends(get_db)
 ):
-    # Handle OPTIONS preflight
-    if request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
     """
     Get a specific interview by ID
     """
-    clerk_user_id = user_info["user_id"]
-    
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user.user_id  # Use user_id (String)
-    ).first()
-    
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
+    interview = get_owned_interview(db, user_info["user_id"], interview_id)
     
     return interview.to_dict()
 
 
 @app.post("/api/interviews/{interview_id}/sessions")
 async def create_interview_session(
-    http_request: Request,
-    interview_id: str,
+    interview_id: UUID,
     request: CreateInterviewSessionRequest,
-    user_info: Optional[dict] = Depends(verify_clerk_token),
+    user_info: dict = Depends(verify_clerk_token),
     db: Session = Depends(get_db)
 ):
-    # Handle OPTIONS preflight
-    if http_request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
     """
     Create a new interview session (conversation turn)
     """
-    clerk_user_id = user_info["user_id"]
-    
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user.user_id  # Use user_id (String)
-    ).first()
-    
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
+    interview = await get_owned_interview_ref(db, user_info["user_id"], interview_id, fresh=True)
     
+    # id/created_at assigned up front so the response needs no refresh round-trip
     session = InterviewSession(
+        id=uuid.uuid4(),
         interview_id=interview.id,
         ai_message=request.ai_message,
         user_message=request.user_message,
-        feedback=None  # Will be filled by AI evaluation
+        feedback=None,  # Will be filled by AI evaluation
+        created_at=utcnow()
     )
+    session_data = session.to_dict()
     db.add(session)
     db.commit()
-    db.refresh(session)
     
-    return session.to_dict()
+    return session_data
 
 
 @app.get("/api/interviews/{interview_id}/sessions")
 async def get_interview_sessions(
-    request: Request,
-    interview_id: str,
+    interview_id: UUID,
     session_run_id: Optional[str] = None,  # Optional query parameter: filter by session run
-    user_info: Optional[dict] = Depends(verify_clerk_token),
+    user_info: dict = Depends(verify_clerk_token),
     db: Session = Depends(get_db)
 ):
-    # Handle OPTIONS preflight
-    if request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
     """
     Get all sessions for an interview.
     If session_run_id is provided, only returns sessions from that run.
     Otherwise, returns all sessions (for viewing history of all mock interviews).
     """
-    clerk_user_id = user_info["user_id"]
-    
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user.user_id
-    ).first()
-    
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
+    interview = await get_owned_interview_ref(db, user_info["user_id"], interview_id)
     
     # Build query
-    query = db.query(InterviewSession).filter(
+    query = db.query(InterviewSession).options(raiseload("*")).filter(
         InterviewSession.interview_id == interview.id
     )
     
     # Filter by session_run_id if provided
     if session_run_id:
         try:
-            import uuid
             run_uuid = uuid.UUID(session_run_id)
             query = query.filter(InterviewSession.session_run_id == run_uuid)
-            print(f"[DEBUG] Filtering sessions by session_run_id: {session_run_id}")
+            logger.debug("Filtering sessions by session_run_id: %s", session_run_id)
         except ValueError:
             # Invalid UUID, ignore filter
             pass
     
     sessions = query.order_by(InterviewSession.created_at.asc()).all()
     
-    print(f"[DEBUG] Returning {len(sessions)} sessions for interview {interview_id}")
+    logger.debug("Returning %d sessions for interview %s", len(sessions), interview_id)
     
     return [session.to_dict() for session in sessions]
 
 
+async def wait_for_processing(db: Session, interview_id: UUID):
+    """
+    Wait until no CV/JD upload for the interview is still pending
+    Uploads return 202 and the client starts right after, so the opening turn would otherwise miss the CV/JD
+    Gives up after PROCESSING_WAIT_SECONDS and lets the interview open with whatever is ready
+    (a pending status left behind by a lost job reads as failed after PROCESSING_STALE_SECONDS, so it isn't waited on)
+    """
+    deadline = time.monotonic() + PROCESSING_WAIT_SECONDS
+    while True:
+        memory = await asyncio.to_thread(get_processing_status_row, db, interview_id)
+        if not memory or STATUS_PENDING not in (memory.cv_status, memory.jd_status):
+            return
+        if time.monotonic() >= deadline:
+            logger.warning("CV/JD processing still pending for interview %s - starting without it", interview_id)
+            return
+        await asyncio.sleep(PROCESSING_POLL_SECONDS)
+
+
 @app.post("/api/interviews/{interview_id}/start")
 async def start_interview(
-    http_request: Request,
-    interview_id: str,
-    user_info: Optional[dict] = Depends(verify_clerk_token),
-    db: Session = Depends(get_db)
+    interview_id: UUID,
+    user_info: dict = Depends(verify_clerk_token),
+    db: Session = Depends(get_db),
+    coordinator: CoordinatorAgent = Depends(get_coordinator)
 ):
     """
     Start an interview session - generates opening question using Coordinator Agent
     Creates a new session_run_id for this interview run (allows multiple mock interviews)
+    Waits for pending CV/JD processing first so the opening question can use them
     """
-    # Handle OPTIONS preflight
-    if http_request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
-    
     clerk_user_id = user_info["user_id"]
     
     # Verify interview belongs to user
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    interview = await get_owned_interview_ref(db, clerk_user_id, interview_id, fresh=True)
     
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user.user_id
-    ).first()
-    
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
+    await wait_for_processing(db, interview.id)
     
     # Create a new session_run_id for this interview run
-    import uuid
     session_run_id = uuid.uuid4()
     
-    # Initialize Coordinator Agent
-    coordinator = CoordinatorAgent()
-    
     # Generate opening question
     try:
-        print(f"[DEBUG] Starting interview {interview_id}, session_run_id: {session_run_id}")
+        logger.debug("Starting interview %s, session_run_id: %s", interview_id, session_run_id)
         result = await coordinator.generate_opening_question(
             interview_id=interview_id,
             interview_title=interview.title,
@@ -896,26 +789,21 @@ async def start_interview(
         )
         
         opening_question = result["question"]
-        print(f"[DEBUG] Generated opening question: {opening_question[:100]}...")
+        logger.debug("Generated opening question: %.100s...", opening_question)
         
-        # Save the opening question as a placeholder session
-        # When the first user message arrives, we'll update this session
+        # Save the opening question as the run's marker session
+        # id is assigned here so no refresh round-trip is needed after commit
+        opening_session_id = uuid.uuid4()
         opening_session = InterviewSession(
+            id=opening_session_id,
             interview_id=interview.id,
             session_run_id=session_run_id,
             ai_message=opening_question,
-            user_message="[INTERVIEW_STARTED]",  # Placeholder - will be updated on first message
+            user_message="[INTERVIEW_STARTED]",  # Marker row - holds the opening question for this run
             feedback=None
         )
-        db.add(opening_session)
-        db.commit()
-        db.refresh(opening_session)
-        print(f"[DEBUG] Saved opening session: {opening_session.id} for new session_run_id: {session_run_id}")
-        
-        # Get interview memory for context
-        memory = db.query(InterviewMemory).filter(
-            InterviewMemory.interview_id == interview.id
-        ).first()
+        await asyncio.to_thread(add_and_commit, db, opening_session)
+        logger.debug("Saved opening session: %s for new session_run_id: %s", opening_session_id, session_run_id)
         
         return {
             "interview_id": interview_id,
@@ -923,56 +811,110 @@ async def start_interview(
             "opening_question": opening_question,
             "interview_title": interview.title,
             "duration_minutes": interview.duration_minutes,
-            "cv_summary": memory.cv_summary if memory else None,
-            "jd_summary": memory.jd_summary if memory else None,
+            "cv_summary": result["cv_summary"],
+            "jd_summary": result["jd_summary"],
             "status": "started"
         }
     except Exception as e:
-        print(f"[ERROR] Error starting interview: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error starting interview: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to start interview: {str(e)}")
 
 
+def _load_run_history(db: Session, interview_id: UUID, session_run_id: Optional[uuid.UUID]):
+    """
+    Resolve the session run for a message and load its last 5 turns (chronological)
+    Blocking DB work - send_message runs this via asyncio.to_thread
+    Returns (session_run_id, recent_sessions_dict)
+    """
+    # If no session_run_id provided, use the most recent one for this interview
+    # (resolved as a subquery so history is fetched in a single round-trip)
+    run_filter = session_run_id
+    if not run_filter:
+        run_filter = db.query(InterviewSession.session_run_id).filter(
+            InterviewSession.interview_id == interview_id
+        ).order_by(InterviewSession.created_at.desc()).limit(1).scalar_subquery()
+    
+    # Get recent conversation history for THIS session run only
+    # Column projection - only the fields the prompt needs, no ORM entity hydration
+    recent_sessions = db.query(
+        InterviewSession.session_run_id,
+        InterviewSession.ai_message,
+        InterviewSession.user_message,
+        InterviewSession.feedback,
+        InterviewSession.created_at
+    ).filter(
+        InterviewSession.interview_id == interview_id,
+        InterviewSession.session_run_id == run_filter
+    ).order_by(InterviewSession.created_at.desc()).limit(5).all()
+    
+    if not session_run_id:
+        if recent_sessions:
+            session_run_id = recent_sessions[0].session_run_id
+            logger.debug("Using existing session_run_id: %s", session_run_id)
+        else:
+            # Create new session run if none exists
+            session_run_id = uuid.uuid4()
+            logger.debug("Created new session_run_id: %s", session_run_id)
+    
+    # Convert to dict format (reversed to chronological order)
+    # created_at stays a datetime - it's only serialized if it reaches a response
+    recent_sessions_dict = [
+        {
+            "ai_message": s.ai_message,
+            "user_message": s.user_message,
+            "feedback": s.feedback,
+            "created_at": s.created_at,
+        }
+        for s in reversed(recent_sessions)
+    ]
+    return session_run_id, recent_sessions_dict
+
+
+def add_and_commit(db: Session, row):
+    """Insert one row on the request's session - blocking, async handlers run it via asyncio.to_thread"""
+    db.add(row)
+    db.commit()
+
+
+def persist_session(session_data: dict):
+    """
+    Background task: insert a message turn using its own short-lived DB session
+    """
+    db = SessionLocal()
+    try:
+        db.add(InterviewSession(**session_data))
+        db.commit()
+        logger.debug("Saved session: %s to run: %s", session_data["id"], session_data["session_run_id"])
+    except Exception as e:
+        db.rollback()
+        logger.exception("Error saving session %s: %s", session_data["id"], e)
+    finally:
+        db.close()
+
+
 @app.post("/api/interviews/{interview_id}/messages")
 async def send_message(
-    http_request: Request,
-    interview_id: str,
+    interview_id: UUID,
     request: SendMessageRequest,
-    user_info: Optional[dict] = Depends(verify_clerk_token),
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    user_info: dict = Depends(verify_clerk_token),
+    db: Session = Depends(get_db),
+    coordinator: CoordinatorAgent = Depends(get_coordinator)
 ):
     """
     Send a message in the interview - AI generates response using Coordinator Agent
+    DB reads/writes run in worker threads so the event loop stays free for other requests
     """
-    # Handle OPTIONS preflight
-    if http_request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
-    
     clerk_user_id = user_info["user_id"]
     
     # Verify interview belongs to user
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user.user_id
-    ).first()
-    
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
+    interview = await get_owned_interview_ref(db, clerk_user_id, interview_id, fresh=True)
     
     if not request.user_message or not request.user_message.strip():
         raise HTTPException(status_code=400, detail="User message cannot be empty")
     
-    # Initialize coordinator agent
-    coordinator = CoordinatorAgent()
-    
     try:
         # Get or create session_run_id
-        import uuid
         session_run_id = None
         if request.session_run_id:
             try:
@@ -980,41 +922,11 @@ async def send_message(
             except ValueError:
                 session_run_id = None
         
-        # If no session_run_id provided, get the most recent one for this interview
-        if not session_run_id:
-            latest_session = db.query(InterviewSession).filter(
-                InterviewSession.interview_id == interview.id
-            ).order_by(InterviewSession.created_at.desc()).first()
-            
-            if latest_session and latest_session.session_run_id:
-                session_run_id = latest_session.session_run_id
-                print(f"[DEBUG] Using existing session_run_id: {session_run_id}")
-            else:
-                # Create new session run if none exists
-                session_run_id = uuid.uuid4()
-                print(f"[DEBUG] Created new session_run_id: {session_run_id}")
-        
-        # Get recent conversation history for THIS session run only
-        recent_sessions = db.query(InterviewSession).filter(
-            InterviewSession.interview_id == interview.id,
-            InterviewSession.session_run_id == session_run_id
-        ).order_by(InterviewSession.created_at.desc()).limit(5).all()
-        
-        # Reverse to get chronological order
-        recent_sessions.reverse()
-        
-        # Convert to dict format
-        recent_sessions_dict = [
-            {
-                "ai_message": s.ai_message,
-                "user_message": s.user_message,
-                "feedback": s.feedback,
-                "created_at": s.created_at.isoformat() if s.created_at else None,
-            }
-            for s in recent_sessions
-        ]
+        session_run_id, recent_sessions_dict = await asyncio.to_thread(
+            _load_run_history, db, interview.id, session_run_id
+        )
         
-        print(f"[DEBUG] Found {len(recent_sessions_dict)} recent sessions for run {session_run_id}")
+        logger.debug("Found %d recent sessions for run %s", len(recent_sessions_dict), session_run_id)
         
         # Generate AI response and feedback (ONLY ONE LLM CALL - FAST!)
         result = await coordinator.generate_follow_up_question(
@@ -1030,104 +942,142 @@ async def send_message(
         ai_message = result["question"]
         feedback = result.get("feedback")
         
-        print(f"[DEBUG] Generated AI response: {ai_message[:100]}...")
+        logger.debug("Generated AI response: %.100s...", ai_message)
         
         # NOTE: MemoryAgent removed from critical path for speed
         # Can be called async/background if needed later
         
-        # Check if this is the first message in this session run
-        existing_sessions = db.query(InterviewSession).filter(
-            InterviewSession.interview_id == interview.id,
-            InterviewSession.session_run_id == session_run_id
-        ).count()
-        
-        # If this is the first message, we need to get the opening question from the start_interview call
-        # It should be in a session with user_message="[INTERVIEW_STARTED]"
-        opening_session = None
-        if existing_sessions == 0:
-            # Look for the opening question session
-            opening_session = db.query(InterviewSession).filter(
-                InterviewSession.interview_id == interview.id,
-                InterviewSession.session_run_id == session_run_id,
-                InterviewSession.user_message == "[INTERVIEW_STARTED]"
-            ).first()
-            
-            if opening_session:
-                # Update the opening session with the actual user message and AI response
-                opening_session.user_message = request.user_message
-                opening_session.ai_message = ai_message
-                opening_session.feedback = feedback
-                db.commit()
-                db.refresh(opening_session)
-                print(f"[DEBUG] Updated opening session: {opening_session.id}")
-                
-                return {
-                    "session_id": str(opening_session.id),
-                    "session_run_id": str(session_run_id),
-                    "ai_message": ai_message,
-                    "feedback": feedback,
-                    "created_at": opening_session.created_at.isoformat() if opening_session.created_at else None
-                }
-        
-        # Save session to database with session_run_id
-        session = InterviewSession(
-            interview_id=interview.id,
-            session_run_id=session_run_id,
-            ai_message=ai_message,
-            user_message=request.user_message,
-            feedback=feedback
-        )
-        db.add(session)
-        db.commit()
-        db.refresh(session)
-        
-        print(f"[DEBUG] Saved session: {session.id} to run: {session_run_id}")
+        # Pre-assign id/timestamp and insert after the response is sent
+        # (the [INTERVIEW_STARTED] row is part of the fetched run history and is left in place)
+        session_id, created_at = uuid.uuid4(), utcnow()
+        background_tasks.add_task(persist_session, {
+            "id": session_id,
+            "interview_id": interview.id,
+            "session_run_id": session_run_id,
+            "ai_message": ai_message,
+            "user_message": request.user_message,
+            "feedback": feedback,
+            "created_at": created_at
+        })
         
         return {
-            "session_id": str(session.id),
+            "session_id": str(session_id),
             "session_run_id": str(session_run_id),
             "ai_message": ai_message,
             "feedback": feedback,
-            "created_at": session.created_at.isoformat() if session.created_at else None
+            "created_at": created_at
         }
     except Exception as e:
-        print(f"Error sending message: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error sending message: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to send message: {str(e)}")
 
 
-@app.get("/api/interviews/{interview_id}/memory")
-async def get_interview_memory(
-    request: Request,
-    interview_id: str,
-    user_info: Optional[dict] = Depends(verify_clerk_token),
-    db: Session = Depends(get_db)
+def _sse_event(payload: dict) -> str:
+    """Format a payload as a Server-Sent Events data frame"""
+    return f"data: {orjson.dumps(payload).decode()}\n\n"
+
+
+@app.post("/api/interviews/{interview_id}/messages/stream")
+async def stream_message(
+    interview_id: UUID,
+    request: SendMessageRequest,
+    user_info: dict = Depends(verify_clerk_token),
+    db: Session = Depends(get_db),
+    coordinator: CoordinatorAgent = Depends(get_coordinator)
 ):
     """
-    Get interview memory (extracted CV/JD details) for personalized interviews
+    Streaming variant of send_message (Server-Sent Events)
+    Emits {"type": "chunk", "text": ...} frames with the question text as the model generates,
+    then one {"type": "done", ...} frame with the same fields send_message returns (incl. feedback)
+    The generator uses its own DB session since it outlives the request dependencies
     """
-    # Handle OPTIONS preflight
-    if request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
-    
     clerk_user_id = user_info["user_id"]
     
     # Verify interview belongs to user
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    interview = await get_owned_interview_ref(db, clerk_user_id, interview_id, fresh=True)
     
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user.user_id
-    ).first()
+    if not request.user_message or not request.user_message.strip():
+        raise HTTPException(status_code=400, detail="User message cannot be empty")
     
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
+    session_run_id = None
+    if request.session_run_id:
+        try:
+            session_run_id = uuid.UUID(request.session_run_id)
+        except ValueError:
+            session_run_id = None
+    
+    async def event_stream():
+        stream_db = SessionLocal()
+        try:
+            run_id, recent_sessions_dict = await asyncio.to_thread(
+                _load_run_history, stream_db, interview.id, session_run_id
+            )
+            result = None
+            async for event in coordinator.stream_follow_up_question(
+                interview_id=interview_id,
+                interview_title=interview.title,
+                user_message=request.user_message,
+                db=stream_db,
+                session_run_id=str(run_id),
+                user_id=clerk_user_id,
+                recent_sessions=recent_sessions_dict
+            ):
+                if event["type"] == "chunk":
+                    yield _sse_event(event)
+                else:
+                    result = event
+            
+            ai_message = result["question"]
+            feedback = result.get("feedback")
+            done = {
+                "type": "done",
+                "session_run_id": str(run_id),
+                "ai_message": ai_message,
+                "feedback": feedback
+            }
+            if result.get("end_session"):
+                done["end_session"] = True
+            
+            # Pre-assign id/timestamp and insert once the client has the full reply
+            session_id, created_at = uuid.uuid4(), utcnow()
+            done["session_id"], done["created_at"] = str(session_id), created_at
+            yield _sse_event(done)
+            await asyncio.to_thread(persist_session, {
+                "id": session_id,
+                "interview_id": interview.id,
+                "session_run_id": run_id,
+                "ai_message": ai_message,
+                "user_message": request.user_message,
+                "feedback": feedback,
+                "created_at": created_at
+            })
+        except Exception as e:
+            logger.exception("Error streaming message: %s", e)
+            yield _sse_event({"type": "error", "detail": f"Failed to send message: {str(e)}"})
+        finally:
+            stream_db.close()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/api/interviews/{interview_id}/memory")
+async def get_interview_memory(
+    interview_id: UUID,
+    user_info: dict = Depends(verify_clerk_token),
+    db: Session = Depends(get_db)
+):
+    """
+    Get interview memory (extracted CV/JD details) for personalized interviews
+    """
+    # Verify interview belongs to user
+    interview = await get_owned_interview_ref(db, user_info["user_id"], interview_id)
     
     # Get memory
-    memory = db.query(InterviewMemory).filter(InterviewMemory.interview_id == interview.id).first()
+    memory = db.query(InterviewMemory).options(raiseload("*")).filter(InterviewMemory.interview_id == interview.id).first()
     
     if not memory:
         return {
@@ -1144,41 +1094,21 @@ async def get_interview_memory(
 
 @app.get("/api/interviews/{interview_id}/details")
 async def get_interview_details(
-    request: Request,
-    interview_id: str,
-    user_info: Optional[dict] = Depends(verify_clerk_token),
+    interview_id: UUID,
+    user_info: dict = Depends(verify_clerk_token),
     db: Session = Depends(get_db)
 ):
     """
     Get interview details including stored text and file info
     """
-    # Handle OPTIONS preflight
-    if request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
-    
-    clerk_user_id = user_info["user_id"]
-    
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user.user_id
-    ).first()
-    
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
+    interview = get_owned_interview(db, user_info["user_id"], interview_id)
     
     # Check for uploaded files
-    cv_files = list(CV_DIR.glob(f"{interview_id}_*"))
-    jd_files = list(JD_DIR.glob(f"{interview_id}_*"))
-    
     return {
         "interview": interview.to_dict(),
         "files": {
-            "cv_files": [f.name for f in cv_files],
-            "jd_files": [f.name for f in jd_files],
+            "cv_files": list_upload_files(CV_DIR, interview_id),
+            "jd_files": list_upload_files(JD_DIR, interview_id),
         },
         "text_status": {
             "job_description": {
@@ -1197,37 +1127,22 @@ async def get_interview_details(
 
 @app.post("/api/interviews/{interview_id}/end")
 async def end_interview(
-    http_request: Request,
-    interview_id: str,
+    interview_id: UUID,
     request: SendMessageRequest,  # Reusing to get session_run_id
-    user_info: Optional[dict] = Depends(verify_clerk_token),
-    db: Session = Depends(get_db)
+    user_info: dict = Depends(verify_clerk_token),
+    db: Session = Depends(get_db),
+    coordinator: CoordinatorAgent = Depends(get_coordinator)
 ):
     """
     End an interview session and clean up ADK resources
     """
-    # Handle OPTIONS preflight
-    if http_request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
-    
     clerk_user_id = user_info["user_id"]
     
     # Verify interview belongs to user
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user.user_id
-    ).first()
-    
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
+    interview = await get_owned_interview_ref(db, clerk_user_id, interview_id, fresh=True)
     
     try:
         # Get session_run_id
-        import uuid
         session_run_id = None
         if request.session_run_id:
             try:
@@ -1236,11 +1151,9 @@ async def end_interview(
                 session_run_id = None
         
         if session_run_id:
-            print(f"[DEBUG] Ending interview session: {session_run_id}")
+            logger.debug("Ending interview session: %s", session_run_id)
             
             # Generate session summary
-            from src.agents.coordinator import CoordinatorAgent
-            coordinator = CoordinatorAgent()
             summary = await coordinator.generate_session_summary(str(session_run_id), clerk_user_id)
             
             # Create a marker session to indicate this run is ended
@@ -1251,8 +1164,7 @@ async def end_interview(
                 user_message="[SESSION_ENDED]",
                 feedback=None
             )
-            db.add(end_session)
-            db.commit()
+            await asyncio.to_thread(add_and_commit, db, end_session)
             
             return {
                 "status": "ended", 
@@ -1264,40 +1176,23 @@ async def end_interview(
         return {"status": "ended", "interview_id": interview_id, "session_run_id": None}
         
     except Exception as e:
-        print(f"[ERROR] Error ending interview: {e}")
+        logger.error("Error ending interview: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to end interview: {str(e)}")
 
 
 @app.get("/api/interviews/{interview_id}/latest-session")
 async def get_latest_session(
-    request: Request,
-    interview_id: str,
-    user_info: Optional[dict] = Depends(verify_clerk_token),
+    interview_id: UUID,
+    user_info: dict = Depends(verify_clerk_token),
     db: Session = Depends(get_db)
 ):
     """
     Get the most recent session for an interview
     Used to check if the last run was ended or to resume the correct run
     """
-    # Handle OPTIONS preflight
-    if request.method == "OPTIONS" or user_info is None:
-        return Response(status_code=200)
-    
-    clerk_user_id = user_info["user_id"]
-    
-    user = db.query(User).filter(User.user_id == clerk_user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user.user_id
-    ).first()
-    
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
+    interview = await get_owned_interview_ref(db, user_info["user_id"], interview_id)
     
-    latest_session = db.query(InterviewSession).filter(
+    latest_session = db.query(InterviewSession).options(raiseload("*")).filter(
         InterviewSession.interview_id == interview.id
     ).order_by(InterviewSession.created_at.desc()).first()
     
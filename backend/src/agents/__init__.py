@@ -2,14 +2,24 @@
 Multi-Agent System for AI Interviewer
 Using Google Generative AI (Gemini) with ADK-style orchestration
 """
+from importlib import import_module
 
-from .base import BaseAgent
-from .coordinator import CoordinatorAgent
-from .interview_memory import InterviewMemory
+# Exports are resolved on first access - importing one submodule (e.g. interview_memory from base)
+# must not pull in coding/coordinator, and through them the code execution tool and google.adk
+_EXPORTS = {
+    "BaseAgent": ".base",
+    "CodingAgent": ".coding",
+    "CoordinatorAgent": ".coordinator",
+    "InterviewMemory": ".interview_memory",
+}
 
-__all__ = [
-    "BaseAgent",
-    "CoordinatorAgent",
-    "InterviewMemory",
-]
+__all__ = list(_EXPORTS)
 
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
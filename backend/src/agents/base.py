@@ -2,33 +2,211 @@
 Base Agent Class - REAL Google ADK Implementation
 Uses google.adk.agents.LlmAgent and google.adk.runners.Runner
 """
+import asyncio
+import inspect
+import logging
 import os
-from typing import Dict, Any, Optional, List
-from dotenv import load_dotenv
-from google.adk.agents import LlmAgent
-from google.adk.runners import Runner, InMemorySessionService
+import random
+import re
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, Any, Optional, List, Tuple, AsyncIterator
 from src.utils.logger import logger
 from src.agents.interview_memory import InterviewMemory
 
-load_dotenv()
+if TYPE_CHECKING:
+    from google.adk.models import Gemini
+    from google.adk.runners import Runner
+
+# google.adk (and dotenv) are imported on first use - the ADK import graph (genai, protobuf, gRPC)
+# costs hundreds of ms, which tooling that only imports this module for reflection should not pay
+_INITIALIZED = False
+
+
+def _create_session_service():
+    """
+    Session service shared by all agents.
+    In-memory by default (single worker); set ADK_SESSION_DB_URL (any SQLAlchemy URL, e.g. the
+    Postgres DATABASE_URL) to keep ADK session state in a database shared by all uvicorn workers.
+    """
+    db_url = os.getenv("ADK_SESSION_DB_URL")
+    if db_url:
+        from google.adk.sessions import DatabaseSessionService
+        logger.info("[ADK] Using DatabaseSessionService for session state")
+        return DatabaseSessionService(db_url=db_url)
+    from google.adk.runners import InMemorySessionService
+    return InMemorySessionService()
 
 
 # Shared session service singleton - ensures sessions persist across agent instances
-_shared_session_service = InMemorySessionService()
+# Created by _lazy_init() when the first agent is constructed
+_shared_session_service = None
+
+
+def _supported_create_session_params(service) -> frozenset:
+    """Which optional create_session parameters (session_id, state) this service accepts - probed once"""
+    params = inspect.signature(service.create_session).parameters
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values()):
+        return frozenset(("session_id", "state"))
+    return frozenset(name for name in ("session_id", "state") if name in params)
+
+
+_CREATE_SESSION_PARAMS: frozenset = frozenset()
+
+
+def _lazy_init() -> None:
+    """Load .env and create the shared session service - once, on first agent construction"""
+    global _INITIALIZED, _shared_session_service, _CREATE_SESSION_PARAMS
+    if _INITIALIZED:
+        return
+    from dotenv import load_dotenv
+    load_dotenv()
+    _shared_session_service = _create_session_service()
+    _CREATE_SESSION_PARAMS = _supported_create_session_params(_shared_session_service)
+    _INITIALIZED = True
+
+
+# Shared Gemini model instances, keyed by model name
+# LlmAgent resolves a model *name* into a fresh Gemini (and HTTP client) on every call;
+# passing one instance per model keeps its client - and its pooled keep-alive connections - warm
+_shared_llms: Dict[str, "Gemini"] = {}
+
+
+def get_shared_llm(model_name: str) -> "Gemini":
+    """Get the process-wide Gemini instance for a model name"""
+    llm = _shared_llms.get(model_name)
+    if llm is None:
+        from google.adk.models import Gemini
+        llm = _shared_llms[model_name] = Gemini(model=model_name)
+    return llm
+
+
+# Runners kept per agent (LRU) - each holds an LlmAgent for one (model, system instruction)
+MAX_CACHED_RUNNERS = 8
+
+# Upper bound on a single 503 retry wait in generate_response
+RETRY_MAX_WAIT_SECONDS = 8.0
+
+# Transient overload / quota errors - matched case-insensitively without lowercasing
+# the (often multi-KB JSON) error text
+_OVERLOADED_RE = re.compile(r"\b(?:503|overloaded)", re.IGNORECASE)
+_QUOTA_RE = re.compile(r"\b(?:429|quota)", re.IGNORECASE)
+
+
+def _is_overloaded(error_str: str) -> bool:
+    """Whether an error message reports a 503 / model overloaded (retryable)"""
+    return _OVERLOADED_RE.search(error_str) is not None
+
 
+# Identical generation errors inside this window are logged once with a traceback
+ERROR_LOG_WINDOW_SECONDS = 60.0
+_last_error_logged: Dict[str, float] = {}
 
-# ADK Content and Part classes - simple objects with required attributes
+
+# Sessions known to exist in the shared service, keyed by (app_name, user_id, session_id)
+# Lets established sessions skip the session-service lookup on every message
+# Bounded LRU - an evicted session just takes the slow path (one get_session) on its next message
+MAX_KNOWN_SESSIONS = 10000
+_known_sessions: "OrderedDict[tuple, None]" = OrderedDict()
+
+
+def _is_known_session(key: tuple) -> bool:
+    if key in _known_sessions:
+        _known_sessions.move_to_end(key)
+        return True
+    return False
+
+
+def _remember_session(key: tuple):
+    _known_sessions[key] = None
+    _known_sessions.move_to_end(key)
+    if len(_known_sessions) > MAX_KNOWN_SESSIONS:
+        _known_sessions.popitem(last=False)
+
+# Per-session locks for the slow path (lookup + create) so concurrent first calls for one session
+# don't create it twice, while first calls for different sessions proceed in parallel.
+# An entry lives only while its first call is in flight - it is dropped whether the create succeeds or fails
+_session_create_locks: Dict[tuple, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+# ADK Content and Part classes - simple slotted objects with required attributes
+@dataclass(slots=True)
 class Content:
     """Simple Content object for ADK Runner - must have .role attribute."""
-    def __init__(self, role: str, parts: list):
-        self.role = role
-        self.parts = parts
+    role: str
+    parts: list
 
 
+@dataclass(slots=True)
 class Part:
     """Simple Part object for ADK Content - must have .text attribute."""
-    def __init__(self, text: str):
-        self.text = text
+    text: str
+
+
+def _user_content(text: str, context: Optional[str] = None) -> Content:
+    """
+    Wrap a prompt as a user message (parts stays a list - ADK may replace parts in place).
+    Context goes in its own leading Part, so the prompt is never concatenated onto it.
+    """
+    if context:
+        return Content("user", [Part(context), Part(text)])
+    return Content("user", [Part(text)])
+
+
+@lru_cache(maxsize=256)
+def _format_memory(items: Tuple[Tuple[str, Any], ...]) -> str:
+    """Format (and cache) a DB memory dict's items as "key: value" lines
+    CV/JD summaries are the same on every turn of an interview, so this is formatted once per interview
+    """
+    return "\n".join(f"{k}: {str(v)[:200]}" for k, v in items if v)
+
+
+def _content_text(content) -> str:
+    """Text of an event content value - a str, an object with .text, or an object with .parts"""
+    if isinstance(content, str):
+        return content
+    text = getattr(content, 'text', None)
+    if text is not None:
+        return text
+    parts = getattr(content, 'parts', None)
+    if parts:
+        return "".join(t for t in (getattr(part, 'text', None) for part in parts) if t)
+    return ""
+
+
+def _extract_text(event) -> str:
+    """Extract the text carried by a single ADK event (empty string if none) - one getattr per shape"""
+    text = getattr(event, 'text', None)
+    if text:
+        return text
+    content = getattr(event, 'content', None)
+    if content:
+        return _content_text(content)
+    message = getattr(event, 'message', None)
+    if message:
+        content = getattr(message, 'content', None)
+        if content:
+            return _content_text(content)
+    return ""
+
+
+# Text extractor per ADK event type, specialized from the first event of that type
+_EXTRACTORS: Dict[type, Callable[[Any], str]] = {}
+
+
+def _build_extractor(event) -> Callable[[Any], str]:
+    """Pick the extractor for this event's type - ADK Events only carry .content, so skip the other probes"""
+    if hasattr(event, 'text') or hasattr(event, 'message'):
+        return _extract_text
+    if hasattr(event, 'content'):
+        def _from_content(e) -> str:
+            content = e.content
+            return _content_text(content) if content else ""
+        return _from_content
+    return _extract_text
 
 
 class BaseAgent:
@@ -36,6 +214,8 @@ class BaseAgent:
     Base class for all agents using REAL Google ADK.
     Properly creates and manages ADK sessions using Runner.start_session().
     """
+    # Fixed attribute set - no per-instance __dict__ (subclasses declare their own __slots__)
+    __slots__ = ("model_name", "temperature", "tools", "_session_service", "_app_name", "_runners")
     
     def __init__(self, model_name: str = "gemini-2.5-flash", temperature: float = 0.7, tools: Optional[List[Any]] = None):
         """
@@ -46,6 +226,7 @@ class BaseAgent:
             temperature: Temperature for response generation (0.0-1.0)
             tools: Optional list of tools to register with the agent
         """
+        _lazy_init()
         self.model_name = model_name
         self.temperature = temperature
         self.tools = tools or []
@@ -53,50 +234,63 @@ class BaseAgent:
         self._session_service = _shared_session_service
         # Use "agents" to match ADK's detected app_name from LlmAgent location
         self._app_name = "agents"
-        # Cache for runners (one per system_instruction)
-        self._runners: Dict[str, Runner] = {}
+        # Cache for runners, keyed by (model_name, system_instruction)
+        self._runners: "OrderedDict[Tuple[str, Optional[str]], Runner]" = OrderedDict()
         
-        logger.info(f"[ADK] Initialized {self.__class__.__name__} with model: {self.model_name}")
+        logger.info("[ADK] Initialized %s with model: %s", self.__class__.__name__, self.model_name)
     
-    def _create_runner(self, system_instruction: Optional[str] = None) -> Runner:
+    def _create_runner(self, system_instruction: Optional[str] = None, model_name: Optional[str] = None) -> "Runner":
         """
-        Create ADK Runner instance for the given system instruction.
-        Caches runners by system_instruction key.
+        Create ADK Runner instance for the given model and system instruction.
+        Caches runners by (model, system_instruction), keeping the MAX_CACHED_RUNNERS most recently used.
         
         Args:
             system_instruction: Optional system instruction for the agent
+            model_name: Model for this call (defaults to self.model_name)
             
         Returns:
             Runner instance
         """
-        cache_key = f"{self.model_name}_{system_instruction or 'default'}"
+        model_name = model_name or self.model_name
+        # Tuple key - no per-call concatenation of the (long) instruction; str hashes are cached
+        cache_key = (model_name, system_instruction)
         
-        if cache_key not in self._runners:
-            # Create LlmAgent
-            agent_data = {
-                "model": self.model_name,
-                "name": self.__class__.__name__.lower().replace("agent", ""),
-            }
-            
-            if system_instruction:
-                agent_data["instruction"] = system_instruction
-                
-            if self.tools:
-                agent_data["tools"] = self.tools
-            
-            llm_agent = LlmAgent(**agent_data)
-            
-            # Create Runner with shared session service
-            runner = Runner(
-                app_name=self._app_name,
-                agent=llm_agent,
-                session_service=self._session_service
-            )
+        runner = self._runners.get(cache_key)
+        if runner is not None:
+            self._runners.move_to_end(cache_key)
+            return runner
+        
+        from google.adk.agents import LlmAgent
+        from google.adk.runners import Runner
+        
+        # Create LlmAgent
+        agent_data = {
+            "model": get_shared_llm(model_name),
+            "name": self.__class__.__name__.lower().replace("agent", ""),
+        }
+        
+        if system_instruction:
+            agent_data["instruction"] = system_instruction
             
-            self._runners[cache_key] = runner
-            logger.debug(f"[ADK] Created Runner for {self.__class__.__name__} with model: {self.model_name}")
+        if self.tools:
+            agent_data["tools"] = self.tools
         
-        return self._runners[cache_key]
+        llm_agent = LlmAgent(**agent_data)
+        
+        # Create Runner with shared session service
+        runner = Runner(
+            app_name=self._app_name,
+            agent=llm_agent,
+            session_service=self._session_service
+        )
+        
+        self._runners[cache_key] = runner
+        if len(self._runners) > MAX_CACHED_RUNNERS:
+            # Technical/behavioral instructions embed the question number, so old turns' runners are dead weight
+            self._runners.popitem(last=False)
+        logger.debug("[ADK] Created Runner for %s with model: %s", self.__class__.__name__, model_name)
+        
+        return runner
     
     async def _ensure_session_exists(
         self,
@@ -114,80 +308,99 @@ class BaseAgent:
             initial_state: Optional initial state for new sessions
             
         Returns:
-            Session object if exists or created, None if error
+            True if the session exists or was created, False if creation failed
         """
+        key = (self._app_name, user_id, session_id)
+        # Fast path - no await, no lock for sessions already known to exist
+        if _is_known_session(key):
+            return True
+        
+        try:
+            async with _session_create_locks[key]:
+                # Re-check: a concurrent call may have created it while we waited
+                if _is_known_session(key):
+                    return True
+                
+                # get_session returns None for a missing session (it doesn't raise)
+                session = await self._session_service.get_session(
+                    app_name=self._app_name,
+                    user_id=user_id,
+                    session_id=session_id
+                )
+                if session is not None:
+                    logger.debug("[ADK] Session %s already exists in service %s", session_id, id(self._session_service))
+                    _remember_session(key)
+                    return True
+                
+                # Session doesn't exist - create it using session_service.create_session()
+                logger.debug("[ADK] Session %s not found, creating new session using session_service.create_session()", session_id)
+                try:
+                    # Call create_session with the parameters this service supports (detected once)
+                    create_kwargs = {"app_name": self._app_name, "user_id": user_id}
+                    if "session_id" in _CREATE_SESSION_PARAMS:
+                        create_kwargs["session_id"] = session_id
+                    # No state -> leave it to the service default (no throwaway {} per call)
+                    if initial_state and "state" in _CREATE_SESSION_PARAMS:
+                        create_kwargs["state"] = initial_state
+                    session = await self._session_service.create_session(**create_kwargs)
+                    # Set state separately if the service doesn't take it
+                    if initial_state and "state" not in _CREATE_SESSION_PARAMS and hasattr(session, 'state'):
+                        session.state.update(initial_state)
+                    
+                    logger.info("[ADK] ✅ Successfully created session %s for user %s", session_id, user_id)
+                    _remember_session(key)
+                    return True
+                except Exception as create_error:
+                    logger.error("[ADK] Failed to create session using session_service.create_session(): %s", create_error)
+                    # Don't raise - let run_async handle session creation if needed
+                    return False
+        finally:
+            # Once known, later calls take the fast path; after a failed create the next call retries
+            # with a fresh lock - either way the entry is not needed any more
+            _session_create_locks.pop(key, None)
+
+    @staticmethod
+    def _ephemeral_session_id() -> str:
+        return f"ephemeral-{uuid.uuid4()}"
+    
+    async def _discard_session(self, session_id: str, user_id: str):
+        """Delete a one-off ADK session so it doesn't accumulate in the session service"""
+        key = (self._app_name, user_id, session_id)
+        _known_sessions.pop(key, None)
+        _session_create_locks.pop(key, None)
         try:
-            # Try to get existing session using session service
-            session = await self._session_service.get_session(
+            await self._session_service.delete_session(
                 app_name=self._app_name,
                 user_id=user_id,
                 session_id=session_id
             )
-            logger.debug(f"[ADK] Session {session_id} already exists in service {id(self._session_service)}")
-            # Debug: Check if session is actually in the internal storage if possible
-            if hasattr(self._session_service, '_sessions'):
-                 logger.debug(f"[ADK] Service sessions keys: {list(self._session_service._sessions.keys())}")
-            return session
-        except (ValueError, KeyError, AttributeError, Exception) as e:
-            # Session doesn't exist - create it using session_service.create_session()
-            logger.debug(f"[ADK] Session {session_id} not found, creating new session using session_service.create_session()")
-            try:
-                # Try different parameter combinations for create_session
-                try:
-                    # Try with all parameters first
-                    session = await self._session_service.create_session(
-                        app_name=self._app_name,
-                        user_id=user_id,
-                        session_id=session_id,
-                        state=initial_state or {}
-                    )
-                except (TypeError, AttributeError):
-                    # Try without state parameter
-                    try:
-                        session = await self._session_service.create_session(
-                            app_name=self._app_name,
-                            user_id=user_id,
-                            session_id=session_id
-                        )
-                        # Set state separately if session has state attribute
-                        if initial_state and hasattr(session, 'state'):
-                            session.state.update(initial_state)
-                    except (TypeError, AttributeError):
-                        # Try with minimal parameters (app_name and user_id only)
-                        session = await self._session_service.create_session(
-                            app_name=self._app_name,
-                            user_id=user_id
-                        )
-                        # Set state separately if session has state attribute
-                        if initial_state and hasattr(session, 'state'):
-                            session.state.update(initial_state)
-                
-                logger.info(f"[ADK] ✅ Successfully created session {session_id} for user {user_id}")
-                return session
-            except Exception as create_error:
-                logger.error(f"[ADK] Failed to create session using session_service.create_session(): {create_error}")
-                # Don't raise - let run_async handle session creation if needed
-                return None
-    
+        except Exception as e:
+            logger.debug("[ADK] Could not delete session %s: %s", session_id, e)
+
     def switch_model(self, new_model_name: str):
-        """Switch to a different model dynamically"""
+        """
+        Switch the default model of this agent
+        Not for per-turn model selection on a shared agent - pass model_name to generate_response instead
+        """
         if new_model_name != self.model_name:
-            logger.info(f"[ADK] Switching model from {self.model_name} to {new_model_name}")
+            logger.info("[ADK] Switching model from %s to %s", self.model_name, new_model_name)
             self.model_name = new_model_name
-            # Clear runner cache so new model is used
-            self._runners.clear()
+            # Runner cache is keyed by model name, so runners for the other model stay reusable
     
-    async def _run_with_adk(
+    async def _stream_with_adk(
         self,
         prompt: str,
         session_id: str,
         user_id: str,
         system_instruction: Optional[str] = None,
         initial_state: Optional[Dict[str, Any]] = None,
-        state_delta: Optional[Dict[str, Any]] = None
-    ) -> str:
+        state_delta: Optional[Dict[str, Any]] = None,
+        context: Optional[str] = None,
+        streaming: bool = False,
+        model_name: Optional[str] = None
+    ) -> AsyncIterator[str]:
         """
-        Run agent with ADK, ensuring session exists before calling run_async.
+        Run agent with ADK and yield response text as events arrive.
         
         Args:
             prompt: The user prompt/question
@@ -196,12 +409,15 @@ class BaseAgent:
             system_instruction: Optional system instruction
             initial_state: Optional initial state for session creation
             state_delta: Optional state updates to apply
+            context: Optional context block, sent as its own Part ahead of the prompt
+            streaming: Request partial (token-level) events from the model
+            model_name: Model for this call (defaults to self.model_name)
             
-        Returns:
-            Generated response text
+        Yields:
+            Response text chunks
         """
         # Create runner
-        runner = self._create_runner(system_instruction=system_instruction)
+        runner = self._create_runner(system_instruction=system_instruction, model_name=model_name)
         
         # Ensure session exists (create if needed) - use session service directly
         await self._ensure_session_exists(
@@ -210,64 +426,95 @@ class BaseAgent:
             initial_state=initial_state
         )
         
-        # Debug Runner state
-        # Ensure session exists in the runner's service
-        # This handles cases where the runner might be using a different service instance or key
+        # Runners from _create_runner share self._session_service, which _ensure_session_exists
+        # just covered - only a subclass runner with a foreign service needs its own create
         service = getattr(runner, 'session_service', None)
-        if service:
+        if service is not None and service is not self._session_service:
             try:
                 await service.create_session(
                     app_name=getattr(runner, 'app_name', 'agents'),
                     user_id=user_id,
                     session_id=session_id,
-                    state=initial_state or {}
+                    state=initial_state or None
                 )
             except Exception:
                 # Session likely already exists, which is fine
                 pass
         
         # Create Content object for ADK
-        new_message = Content(role="user", parts=[Part(text=prompt)])
+        new_message = _user_content(prompt, context)
+        
+        run_kwargs = {}
+        if streaming:
+            from google.adk.agents.run_config import RunConfig, StreamingMode
+            run_kwargs["run_config"] = RunConfig(streaming_mode=StreamingMode.SSE)
         
         # Run agent - session now exists
-        response_text = ""
+        seen_partial = False
         try:
             async for event in runner.run_async(
                 user_id=user_id,
                 session_id=session_id,
                 new_message=new_message,
-                state_delta=state_delta
+                state_delta=state_delta,
+                **run_kwargs
             ):
-                # Collect text from response events
-                if hasattr(event, 'text') and event.text:
-                    response_text += event.text
-                elif hasattr(event, 'content') and event.content:
-                    if isinstance(event.content, str):
-                        response_text += event.content
-                    elif hasattr(event.content, 'text'):
-                        response_text += event.content.text
-                    elif hasattr(event.content, 'parts'):
-                        # Handle parts list
-                        for part in event.content.parts:
-                            if hasattr(part, 'text') and part.text:
-                                response_text += part.text
-                elif hasattr(event, 'message') and event.message:
-                    if hasattr(event.message, 'content'):
-                        if isinstance(event.message.content, str):
-                            response_text += event.message.content
-                        elif hasattr(event.message.content, 'text') and event.message.content.text:
-                            response_text += event.message.content.text
-                        elif hasattr(event.message.content, 'parts'):
-                            for part in event.message.content.parts:
-                                if hasattr(part, 'text') and part.text:
-                                    response_text += part.text
+                # In SSE mode the final event repeats the text already sent as partials
+                if getattr(event, 'partial', False):
+                    seen_partial = True
+                elif seen_partial:
+                    continue
+                extractor = _EXTRACTORS.get(type(event))
+                if extractor is None:
+                    extractor = _EXTRACTORS[type(event)] = _build_extractor(event)
+                text = extractor(event)
+                if text:
+                    yield text
         except Exception as e:
-            import sys
-            sys.stderr.write(f"[ADK-DEBUG] Error in run_async loop: {e}\n")
+            logger.debug("[ADK] Error in run_async loop: %s", e)
             # Re-raise to be handled by caller
             raise e
+    
+    async def _run_with_adk(
+        self,
+        prompt: str,
+        session_id: str,
+        user_id: str,
+        system_instruction: Optional[str] = None,
+        initial_state: Optional[Dict[str, Any]] = None,
+        state_delta: Optional[Dict[str, Any]] = None,
+        context: Optional[str] = None,
+        model_name: Optional[str] = None
+    ) -> str:
+        """
+        Run agent with ADK, ensuring session exists before calling run_async.
         
-        return response_text.strip()
+        Args:
+            prompt: The user prompt/question
+            session_id: Session ID (session_run_id)
+            user_id: User ID
+            system_instruction: Optional system instruction
+            initial_state: Optional initial state for session creation
+            state_delta: Optional state updates to apply
+            context: Optional context block, sent as its own Part ahead of the prompt
+            model_name: Model for this call (defaults to self.model_name)
+            
+        Returns:
+            Generated response text
+        """
+        chunks = [
+            chunk async for chunk in self._stream_with_adk(
+                prompt=prompt,
+                session_id=session_id,
+                user_id=user_id,
+                system_instruction=system_instruction,
+                initial_state=initial_state,
+                state_delta=state_delta,
+                context=context,
+                model_name=model_name
+            )
+        ]
+        return "".join(chunks).strip()
     
     async def generate_response(
         self,
@@ -279,7 +526,9 @@ class BaseAgent:
         memory: Optional[Dict[str, Any]] = None,
         session_id: Optional[str] = None,
         user_id: Optional[str] = None,
-        state_delta: Optional[Dict[str, Any]] = None
+        state_delta: Optional[Dict[str, Any]] = None,
+        request_timeout: Optional[float] = None,
+        model_name: Optional[str] = None
     ) -> str:
         """
         Generate a response using Google ADK Runner.
@@ -292,68 +541,81 @@ class BaseAgent:
             temperature: Override default temperature (not used, kept for compatibility)
             max_output_tokens: Maximum tokens in response (not used, kept for compatibility)
             memory: Optional DB memory dict (CV/JD summaries) - included in context
-            session_id: Session ID for ADK session management
+            session_id: Session ID for ADK session management (None = one-off session, deleted after the call)
             user_id: User ID for ADK session management
             state_delta: Optional state updates to apply
+            request_timeout: Seconds to wait for one model run before retrying (None = no limit)
+                Session-less calls only - ADK writes the user turn to a real session before calling
+                the model, so cutting off a session-bound run would leave that turn unanswered
+            model_name: Model for this call (defaults to self.model_name) - agents are shared
+                across requests, so per-turn model choices are passed here, never set on the agent
             
         Returns:
             Generated response text
         """
+        # Calls without a session get a throwaway session, dropped afterwards, so they
+        # neither see nor grow a history shared by every other session-less call
+        session_id_for_adk = session_id or self._ephemeral_session_id()
+        # Resolved once - the retries below must not pick up a different default
+        model_name = model_name or self.model_name
+        
         try:
-            # Build full message with context
-            context_parts = []
-            
-            if memory:
-                memory_str = "\n".join([f"{k}: {str(v)[:200]}" for k, v in memory.items() if v])
-                if memory_str:
-                    context_parts.append(f"DB CONTEXT:\n{memory_str}")
-            
-            if context:
-                context_parts.append(context)
+            # Build the context block (DB memory + context) - sent as a separate Part
+            context_block = self._build_context_block(context, memory)
             
-            full_context = "\n\n".join(context_parts) if context_parts else ""
-            user_message = f"{full_context}\n\n{prompt}" if full_context else prompt
-            
-            logger.debug(f"[ADK] Generating response with model: {self.model_name}")
-            logger.debug(f"[ADK] System instruction: {bool(system_instruction)}")
-            logger.debug(f"[ADK] User message length: {len(user_message)} chars")
-            logger.debug(f"[ADK] Session ID: {session_id}")
+            # One level check for the whole trace block (len()/bool() args are evaluated eagerly)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[ADK] Generating response with model: %s | System instruction: %s | User message length: %s chars | Session ID: %s",
+                    model_name, bool(system_instruction), len(context_block) + len(prompt), session_id
+                )
             
             # Use ADK's proper async execution
             user_id_for_adk = user_id or "default_user"
-            session_id_for_adk = session_id or "default_session"
             
             # Use state_delta as initial state if provided for new sessions
-            initial_state = state_delta if state_delta else {}
+            initial_state = state_delta or None
             
-            # Retry loop for 503 errors
+            # Retry loop for 503 errors and timed-out (stalled) runs
             max_retries = 3
-            import asyncio
+            # Only throwaway sessions can be cut off and rerun from scratch
+            attempt_timeout = request_timeout if session_id is None else None
             
             for attempt in range(max_retries):
                 try:
                     # Run with ADK - this will create session if needed
-                    response_text = await self._run_with_adk(
-                        prompt=user_message,
+                    run = self._run_with_adk(
+                        prompt=prompt,
+                        context=context_block,
                         session_id=session_id_for_adk,
                         user_id=user_id_for_adk,
                         system_instruction=system_instruction,
                         initial_state=initial_state,
-                        state_delta=state_delta
+                        state_delta=state_delta,
+                        model_name=model_name
                     )
+                    response_text = await (asyncio.wait_for(run, attempt_timeout) if attempt_timeout else run)
                     
                     result = response_text if response_text else "I apologize, but I couldn't generate a response. Please try again."
                     
-                    logger.info(f"[ADK] ✅ Successfully generated response ({len(result)} chars)")
+                    logger.info("[ADK] ✅ Successfully generated response (%s chars)", len(result))
                     return result
                     
                 except Exception as e:
-                    error_str = str(e)
-                    is_overloaded = "503" in error_str or "overloaded" in error_str.lower()
-                    
-                    if is_overloaded and attempt < max_retries - 1:
-                        wait_time = 2 ** attempt  # 1s, 2s, 4s
-                        logger.warning(f"[ADK] Model overloaded (503). Retrying in {wait_time}s (Attempt {attempt+1}/{max_retries})...")
+                    is_timeout = isinstance(e, asyncio.TimeoutError)
+                    if (is_timeout or _is_overloaded(str(e))) and attempt < max_retries - 1:
+                        if session_id is None:
+                            # One-off session - retry on a fresh one so the failed attempt's turn isn't replayed
+                            await self._discard_session(session_id_for_adk, user_id_for_adk)
+                            session_id_for_adk = self._ephemeral_session_id()
+                        
+                        # Exponential backoff (1s, 2s, ...) plus jitter, so concurrent sessions hit by
+                        # the same overload don't all retry in lockstep
+                        wait_time = min(2 ** attempt + random.uniform(0, 1), RETRY_MAX_WAIT_SECONDS)
+                        if is_timeout:
+                            logger.warning("[ADK] No response within %ss. Retrying in %.1fs (Attempt %s/%s)...", attempt_timeout, wait_time, attempt + 1, max_retries)
+                        else:
+                            logger.warning("[ADK] Model overloaded (503). Retrying in %.1fs (Attempt %s/%s)...", wait_time, attempt + 1, max_retries)
                         await asyncio.sleep(wait_time)
                         continue
                     
@@ -361,20 +623,126 @@ class BaseAgent:
                     raise e
             
         except Exception as e:
-            # Check for specific Google API errors
-            error_str = str(e)
-            if "503" in error_str or "overloaded" in error_str.lower():
-                logger.warning(f"[ADK] Model overloaded (503) after retries.")
-                return "I'm currently experiencing very high traffic. Please give me a moment and try asking again."
+            return self._error_message(e)
+        finally:
+            if session_id is None:
+                await self._discard_session(session_id_for_adk, user_id or "default_user")
+    
+    async def stream_response(
+        self,
+        prompt: str,
+        system_instruction: Optional[str] = None,
+        context: Optional[str] = None,
+        memory: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        state_delta: Optional[Dict[str, Any]] = None,
+        model_name: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response using Google ADK Runner, yielding text chunks as the model produces them.
+        Same message building and error fallbacks as generate_response, but no retries -
+        once chunks have been sent to the client the turn cannot be replayed.
+        
+        Args:
+            prompt: The main user prompt/question
+            system_instruction: System-level instructions for the agent
+            context: Additional context as a formatted string
+            memory: Optional DB memory dict (CV/JD summaries) - included in context
+            session_id: Session ID for ADK session management (None = one-off session, deleted after the call)
+            user_id: User ID for ADK session management
+            state_delta: Optional state updates to apply
+            model_name: Model for this call (defaults to self.model_name)
             
-            if "429" in error_str or "quota" in error_str.lower():
-                logger.warning(f"[ADK] Quota exceeded (429).")
-                return "I've reached my usage limit for the moment. Please try again in a minute."
-                
-            logger.error(f"[ADK] Error generating response in {self.__class__.__name__}: {e}")
-            import traceback
-            logger.error(f"[ADK] Traceback:\n{traceback.format_exc()}")
-            return "I apologize, but I encountered a temporary issue. Please try again."
+        Yields:
+            Response text chunks
+        """
+        context_block = self._build_context_block(context, memory)
+        session_id_for_adk = session_id or self._ephemeral_session_id()
+        sent_any = False
+        try:
+            async for chunk in self._stream_with_adk(
+                prompt=prompt,
+                context=context_block,
+                session_id=session_id_for_adk,
+                user_id=user_id or "default_user",
+                system_instruction=system_instruction,
+                initial_state=state_delta or None,
+                state_delta=state_delta,
+                streaming=True,
+                model_name=model_name
+            ):
+                sent_any = True
+                yield chunk
+        except Exception as e:
+            if sent_any:
+                logger.error("[ADK] Stream interrupted in %s: %s", self.__class__.__name__, e)
+                return
+            yield self._error_message(e)
+            return
+        finally:
+            if session_id is None:
+                await self._discard_session(session_id_for_adk, user_id or "default_user")
+        
+        if not sent_any:
+            yield "I apologize, but I couldn't generate a response. Please try again."
+    
+    @staticmethod
+    def compile_prompt(template: str) -> Callable[..., str]:
+        """
+        Turn a str.format template into a prompt function: fill(**fields) -> str.
+        Subclasses define prompt templates once at module level instead of rebuilding
+        f-strings per call - prompts from one template always share a byte-identical prefix.
+        """
+        fill = template.format_map
+        return lambda **fields: fill(fields)
+    
+    @staticmethod
+    def _build_context_block(
+        context: Optional[str] = None,
+        memory: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Join the DB memory and context blocks that precede the prompt ("" if none)."""
+        context_parts = []
+        
+        if memory:
+            items = tuple(memory.items())
+            try:
+                memory_str = _format_memory(items)
+            except TypeError:
+                # Unhashable values - format without caching
+                memory_str = _format_memory.__wrapped__(items)
+            if memory_str:
+                context_parts.append(f"DB CONTEXT:\n{memory_str}")
+        
+        if context:
+            context_parts.append(context)
+        
+        return "\n\n".join(context_parts)
+    
+    def _error_message(self, e: Exception) -> str:
+        """Map a generation error to the user-facing fallback message."""
+        # Check for specific Google API errors
+        error_str = str(e)
+        if _is_overloaded(error_str):
+            logger.warning("[ADK] Model overloaded (503) after retries.")
+            return "I'm currently experiencing very high traffic. Please give me a moment and try asking again."
+        
+        if _QUOTA_RE.search(error_str):
+            logger.warning("[ADK] Quota exceeded (429).")
+            return "I've reached my usage limit for the moment. Please try again in a minute."
+            
+        # Full traceback once per distinct error per window; repeats (e.g. a retry storm) get one line
+        error_key = f"{type(e).__name__}:{error_str[:200]}"
+        now = time.monotonic()
+        if now - _last_error_logged.get(error_key, float("-inf")) >= ERROR_LOG_WINDOW_SECONDS:
+            if len(_last_error_logged) >= 256:
+                _last_error_logged.clear()
+            _last_error_logged[error_key] = now
+            logger.error("[ADK] Error generating response in %s", self.__class__.__name__, exc_info=e)
+        else:
+            logger.error("[ADK] Error generating response in %s (repeated): %s", self.__class__.__name__, e)
+        return "I apologize, but I encountered a temporary issue. Please try again."
     
     async def get_session_memory(self, session_id: str, user_id: str) -> Optional[InterviewMemory]:
         """
@@ -387,26 +755,20 @@ class BaseAgent:
         Returns:
             InterviewMemory object or None
         """
-        try:
-            # Get session using session service directly
-            try:
-                session = await self._session_service.get_session(
-                    app_name=self._app_name,
-                    user_id=user_id,
-                    session_id=session_id
-                )
-                
-                # Extract state from session
-                if hasattr(session, 'state') and session.state:
-                    memory = InterviewMemory.from_dict(dict(session.state))
-                    return memory
-            except (ValueError, KeyError, AttributeError):
-                # Session doesn't exist yet - that's okay
-                pass
-            
+        # get_session returns None for a missing session - only real service failures raise, and those propagate
+        session = await self._session_service.get_session(
+            app_name=self._app_name,
+            user_id=user_id,
+            session_id=session_id
+        )
+        if session is None or not session.state:
             return None
-        except Exception as e:
-            logger.debug(f"[ADK] Could not retrieve session memory: {e}")
+        
+        try:
+            return InterviewMemory.from_dict(dict(session.state))
+        except (TypeError, ValueError) as e:
+            # State written by something other than InterviewMemory (e.g. a malformed start_time)
+            logger.debug("[ADK] Could not parse session memory: %s", e)
             return None
     
     def set_session_memory(
@@ -427,15 +789,15 @@ class BaseAgent:
         try:
             # ADK manages state through state_delta in run_async
             # This method is kept for compatibility
-            logger.debug(f"[ADK] Session state managed by ADK Runner via state_delta")
+            logger.debug("[ADK] Session state managed by ADK Runner via state_delta")
         except Exception as e:
-            logger.error(f"[ADK] Error setting session memory: {e}")
+            logger.error("[ADK] Error setting session memory: %s", e)
     
     def reset_session(self, session_id: str, user_id: str):
         """Reset/delete ADK session (start new interview run)"""
         try:
             # TODO: Implement session deletion if needed
-            logger.info(f"[ADK] Session reset requested for {session_id}")
+            logger.info("[ADK] Session reset requested for %s", session_id)
         except Exception as e:
-            logger.warning(f"[ADK] Error resetting session: {e}")
+            logger.warning("[ADK] Error resetting session: %s", e)
     
\ No newline at end of file
@@ -2,26 +2,12 @@
 Coding Agent - Handles code generation and execution
 Uses Piston API for safe code execution.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Final, Optional
 from .base import BaseAgent
 from src.tools.code_execution import get_code_execution_tool
 
-class CodingAgent(BaseAgent):
-    """
-    Agent responsible for writing and executing code.
-    Specializes in Python, C++, C, and Java.
-    """
-    
-    def __init__(self):
-        # Use Gemini Pro for better coding capabilities
-        super().__init__(
-            model_name="gemini-2.5-pro", 
-            temperature=0.2,
-            tools=[get_code_execution_tool()]
-        )
-        
-    def get_system_instruction(self) -> str:
-        return """You are an expert Coding Interview Agent.
+# Built once - the same object is reused as the runner cache key on every coding turn
+_CODING_SYSTEM_INSTRUCTION: Final[str] = """You are an expert Coding Interview Agent.
 Your goal is to help candidates write, debug, and optimize code during technical interviews.
 
 CAPABILITIES:
@@ -43,6 +29,25 @@ TOOL USAGE:
 - If execution fails, explain the error and try to fix the code.
 """
 
+
+class CodingAgent(BaseAgent):
+    """
+    Agent responsible for writing and executing code.
+    Specializes in Python, C++, C, and Java.
+    """
+    __slots__ = ()
+    
+    def __init__(self):
+        # Use Gemini Pro for better coding capabilities
+        super().__init__(
+            model_name="gemini-2.5-pro", 
+            temperature=0.2,
+            tools=[get_code_execution_tool()]
+        )
+        
+    def get_system_instruction(self) -> str:
+        return _CODING_SYSTEM_INSTRUCTION
+
     async def generate_response(
         self,
         prompt: str,
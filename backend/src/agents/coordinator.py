@@ -2,9 +2,16 @@
 Optimized Coordinator Agent - Production-ready with state machine and smart context
 Implements all 9 optimizations for faster, smarter, more adaptive interviews
 """
-from typing import Dict, Any, Optional, List
+import asyncio
+import hashlib
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, AsyncIterator
 from datetime import datetime
+from cachetools import TTLCache
 from .base import BaseAgent
+from .coding import CodingAgent
 from .interview_state import InterviewState, answer_depth
 from .interview_memory import InterviewMemory
 from src.memory.loader import (
@@ -21,6 +28,218 @@ from sqlalchemy.orm import Session
 from src.utils.logger import logger
 
 
+# Stage-specific system instructions (FIX 9) - static text only, so each stage's instruction
+# shares a byte-identical prefix across turns and candidates; per-turn details go in _STAGE_SUFFIXES
+_STAGE_PREFIXES: Dict[str, str] = {
+    "intro": """You are a thoughtful senior technical interviewer. Your job: run a realistic, adaptive 1-on-1 interview that feels human.
+
+Current Stage: INTRO
+
+High-level rules:
+1. Always greet the candidate by name.
+2. Reference one concrete item from the CV or JD early to show familiarity.
+3. Keep answers concise (question length 1–3 sentences).
+4. Maintain a friendly, professional tone.
+
+Stage behavior:
+- Greet: "Hello <candidate name>, glad to meet you."
+- Reference one CV highlight if available.
+- Prompt: Ask for a 60–90 second self-introduction focused on impact and responsibilities.
+
+End with a single QUESTION line.""",
+
+    "technical": """You are a thoughtful senior technical interviewer. Your job: run a realistic, adaptive 1-on-1 interview that feels human.
+
+Current Stage: TECHNICAL
+
+High-level rules:
+1. Ask technical questions based on job requirements and CV.
+2. Probe deeper into their answers - if they mention something, ask for details.
+3. Reference specific skills from their CV.
+4. Test their understanding, not just memorization.
+5. Gradually increase difficulty based on their answers.
+
+Stage behavior:
+- Use candidate CV + JD to choose relevant topics.
+- Start with an anchor question on a recent project or skill.
+- Apply probing loop: clarify requirements → ask for approach → ask about trade-offs → ask about edge cases.
+- Increase difficulty when candidate shows depth; otherwise probe deeper on fundamentals.
+
+Scoring & feedback:
+- If answer is shallow (depth < 0.5), probe deeper.
+- If answer is strong (depth > 0.7), escalate difficulty.
+
+End with a single QUESTION line and optional FEEDBACK.""",
+
+    "behavioral": """You are a thoughtful senior technical interviewer. Your job: run a realistic, adaptive 1-on-1 interview that feels human.
+
+Current Stage: BEHAVIORAL
+
+High-level rules:
+1. Ask about past projects and experiences using STAR method.
+2. Focus on problem-solving, teamwork, leadership, ownership.
+3. Ask situational questions.
+
+Stage behavior:
+- Ask STAR-style prompts: Situation, Task, Action, Result.
+- Focus on ownership, communication, team interactions, and learning.
+
+End with a single QUESTION line and optional FEEDBACK.""",
+
+    "closing": """You are a thoughtful senior technical interviewer. Your job: run a realistic, adaptive 1-on-1 interview that feels human.
+
+Current Stage: CLOSING
+
+High-level rules:
+1. Wrap up the interview.
+2. Ask if they have any questions.
+3. Provide next-step expectations.
+
+Stage behavior:
+- Thank candidate, ask if they have questions, provide next-step expectations.
+- Keep it professional and positive.
+
+End with a single QUESTION line."""
+}
+
+# Dynamic tail appended after the static prefix
+_STAGE_SUFFIXES: Dict[str, str] = {
+    "intro": "\n\nCandidate Name: {candidate_name}",
+    "technical": "\n\nCandidate: {candidate_name}\nQuestion #{question_count}",
+    "behavioral": "\n\nCandidate: {candidate_name}\nQuestion #{question_count}",
+    "closing": "\n\nCandidate: {candidate_name}",
+}
+
+
+@lru_cache(maxsize=1024)
+def _build_stage_instruction(stage: str, candidate_name: str, question_count: int) -> str:
+    """Build (and cache) the system instruction for a stage - static prefix, then the dynamic suffix"""
+    suffix = _STAGE_SUFFIXES[stage].format(candidate_name=candidate_name, question_count=question_count)
+    return _STAGE_PREFIXES[stage] + suffix
+
+
+# QUESTION:/FEEDBACK: response layout - one scan; question runs up to the first FEEDBACK: marker
+# Anything before the first QUESTION: label (e.g. "Sure! QUESTION: ...") is dropped, unless it already holds FEEDBACK:
+_QUESTION_FEEDBACK_RE = re.compile(
+    r"(?:(?:(?!FEEDBACK:).)*?QUESTION:)?(?P<question>.*?)(?:FEEDBACK:(?P<feedback>.*))?\Z", re.DOTALL
+)
+
+# Opening greetings keyed on everything that shapes them (model, instruction, CV/JD context, name)
+# Re-running an interview for the same CV/JD reuses the greeting instead of another Pro call
+OPENING_CACHE_TTL_SECONDS = int(os.getenv("OPENING_CACHE_TTL_SECONDS", "86400"))
+_opening_cache: TTLCache = TTLCache(maxsize=1000, ttl=OPENING_CACHE_TTL_SECONDS)
+
+
+def _opening_cache_key(*parts: Optional[str]) -> str:
+    """Hash the opening-question inputs into a cache key"""
+    return hashlib.blake2b("\x1f".join(p or "" for p in parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+# Turn prompts (FIX 5) - compiled once, filled per call
+_build_opening_prompt = BaseAgent.compile_prompt("""Generate a warm, personalized opening greeting and question.
+
+Greet {candidate_name} by name.
+Start with exactly: "I am SAI, your AI interviewer."
+Reference one concrete item from their CV/JD if available to show familiarity.
+Ask for a 60–90 second self-introduction focused on impact and responsibilities.
+Keep it friendly and professional (2-3 sentences max).
+
+Format:
+QUESTION: [your greeting and question]""")
+
+# Static instructions first, per-turn details last - every follow-up prompt shares the long task prefix
+_build_follow_up_prompt = BaseAgent.compile_prompt("""Generate the next interview question and feedback.
+
+TASK:
+1. Read their answer carefully.
+2. Apply the probing loop:
+   - If they just started a topic: ask for their approach/design.
+   - If they gave a high-level answer: ask about trade-offs or specific implementation details.
+   - If they gave a detailed answer: ask about edge cases or scaling.
+3. If answer was brief (depth < 0.5), probe deeper: "Can you tell me more about...?"
+4. If answer was good (depth > 0.7), acknowledge and go deeper.
+5. Reference what they just said in your next question.
+6. DO NOT REPEAT previous questions or answers.
+
+Generate:
+1. Your next question (2-3 sentences, builds on their answer)
+2. Brief, specific feedback that references something from their answer
+
+Format your response as:
+QUESTION: [your question]
+FEEDBACK: [brief feedback referencing their answer]
+
+INTERVIEW CONTEXT:
+- Title: {interview_title}
+- Stage: {stage}
+- Question #{question_count}
+- Candidate: {candidate_name}
+- Last Answer Depth: {last_answer_depth:.1f}/1.0
+- Time Remaining: {time_remaining:.1f} mins
+
+CONVERSATION SUMMARY:
+{conversation_summary}
+
+CANDIDATE'S LATEST RESPONSE:
+{user_message}""")
+
+
+class _QuestionStream:
+    """
+    Incremental QUESTION:/FEEDBACK: split for streamed follow-ups.
+    feed() returns the newly visible question text - the QUESTION: label is dropped and everything
+    from FEEDBACK: on is held back (feedback arrives parsed in the final event).
+    """
+    __slots__ = ("_buffer", "_sent", "_closed")
+    
+    _LABEL = "QUESTION:"
+    _MARKER = "FEEDBACK:"
+    
+    def __init__(self):
+        self._buffer = ""
+        self._sent = 0  # Buffer offset up to which question text has been returned
+        self._closed = False  # FEEDBACK: seen - nothing more to return
+    
+    def feed(self, chunk: str) -> str:
+        self._buffer += chunk
+        return self._take(final=False)
+    
+    def finish(self) -> str:
+        """Return any question text still held back once the stream has ended."""
+        return self._take(final=True)
+    
+    def _take(self, final: bool) -> str:
+        if self._closed:
+            return ""
+        buffer = self._buffer
+        start = len(buffer) - len(buffer.lstrip())
+        head = buffer[start:]
+        if head.startswith(self._LABEL):
+            start += len(self._LABEL)
+        elif not final and self._LABEL.startswith(head):
+            # Could still be the start of the label - wait for more text
+            return ""
+        
+        end = buffer.find(self._MARKER, start)
+        if end != -1:
+            self._closed = True
+        elif final:
+            end = len(buffer)
+        else:
+            # Hold back a possible partial FEEDBACK: marker at the tail
+            end = len(buffer) - len(self._MARKER) + 1
+        
+        begin = max(start, self._sent)
+        if end <= begin:
+            return ""
+        text = buffer[begin:end]
+        if not buffer[start:begin].strip():
+            # Nothing visible sent yet - drop the whitespace after the label
+            text = text.lstrip()
+        self._sent = end
+        return text
+
+
 class CoordinatorAgent(BaseAgent):
     """
     Optimized Coordinator Agent with:
@@ -34,10 +253,22 @@ class CoordinatorAgent(BaseAgent):
     - Optimized Gemini Flash calls (FIX 8)
     - Stage-specific prompts (FIX 9)
     """
+    __slots__ = ("_coding_agent", "request_timeout")
     
-    def __init__(self):
-        # Start with Flash - will switch to Pro for large prompts
+    def __init__(self, request_timeout: float = 20.0):
+        # Flash by default - stage-specific models are chosen per call (one instance serves every request)
         super().__init__(model_name="gemini-2.5-flash", temperature=0.6)
+        self._coding_agent: Optional[CodingAgent] = None
+        # Per-attempt limit for session-less runs (summaries) - a stalled call is retried instead of waited out
+        # Interview turns run on the candidate's ADK session and are never cut off (see generate_response)
+        self.request_timeout = request_timeout
+    
+    @property
+    def coding_agent(self) -> CodingAgent:
+        """CodingAgent for code turns - created on first use and reused (keeps its runner cache warm)"""
+        if self._coding_agent is None:
+            self._coding_agent = CodingAgent()
+        return self._coding_agent
     
     def _select_model_for_stage(self, stage: str) -> str:
         """
@@ -105,85 +336,10 @@ class CoordinatorAgent(BaseAgent):
     
     def _get_stage_system_instruction(self, state: InterviewState) -> str:
         """Get stage-specific system instruction (FIX 9)."""
-        stage_instructions = {
-            "intro": f"""You are a thoughtful senior technical interviewer. Your job: run a realistic, adaptive 1-on-1 interview that feels human.
-
-Current Stage: INTRO
-Candidate Name: {state.candidate_name}
-
-High-level rules:
-1. Always greet the candidate by name.
-2. Reference one concrete item from the CV or JD early to show familiarity.
-3. Keep answers concise (question length 1–3 sentences).
-4. Maintain a friendly, professional tone.
-
-Stage behavior:
-- Greet: "Hello {state.candidate_name}, glad to meet you."
-- Reference one CV highlight if available.
-- Prompt: Ask for a 60–90 second self-introduction focused on impact and responsibilities.
-
-End with a single QUESTION line.""",
-
-            "technical": f"""You are a thoughtful senior technical interviewer. Your job: run a realistic, adaptive 1-on-1 interview that feels human.
-
-Current Stage: TECHNICAL
-Candidate: {state.candidate_name}
-Question #{state.question_count}
-
-High-level rules:
-1. Ask technical questions based on job requirements and CV.
-2. Probe deeper into their answers - if they mention something, ask for details.
-3. Reference specific skills from their CV.
-4. Test their understanding, not just memorization.
-5. Gradually increase difficulty based on their answers.
-
-Stage behavior:
-- Use candidate CV + JD to choose relevant topics.
-- Start with an anchor question on a recent project or skill.
-- Apply probing loop: clarify requirements → ask for approach → ask about trade-offs → ask about edge cases.
-- Increase difficulty when candidate shows depth; otherwise probe deeper on fundamentals.
-
-Scoring & feedback:
-- If answer is shallow (depth < 0.5), probe deeper.
-- If answer is strong (depth > 0.7), escalate difficulty.
-
-End with a single QUESTION line and optional FEEDBACK.""",
-
-            "behavioral": f"""You are a thoughtful senior technical interviewer. Your job: run a realistic, adaptive 1-on-1 interview that feels human.
-
-Current Stage: BEHAVIORAL
-Candidate: {state.candidate_name}
-Question #{state.question_count}
-
-High-level rules:
-1. Ask about past projects and experiences using STAR method.
-2. Focus on problem-solving, teamwork, leadership, ownership.
-3. Ask situational questions.
-
-Stage behavior:
-- Ask STAR-style prompts: Situation, Task, Action, Result.
-- Focus on ownership, communication, team interactions, and learning.
-
-End with a single QUESTION line and optional FEEDBACK.""",
-
-            "closing": f"""You are a thoughtful senior technical interviewer. Your job: run a realistic, adaptive 1-on-1 interview that feels human.
-
-Current Stage: CLOSING
-Candidate: {state.candidate_name}
-
-High-level rules:
-1. Wrap up the interview.
-2. Ask if they have any questions.
-3. Provide next-step expectations.
-
-Stage behavior:
-- Thank candidate, ask if they have questions, provide next-step expectations.
-- Keep it professional and positive.
-
-End with a single QUESTION line."""
-        }
-        
-        return stage_instructions.get(state.stage, stage_instructions["technical"])
+        stage = state.stage if state.stage in _STAGE_PREFIXES else "technical"
+        # Intro/closing suffixes don't show the question number - keep one cache entry per candidate
+        question_count = state.question_count if "{question_count}" in _STAGE_SUFFIXES[stage] else 0
+        return _build_stage_instruction(stage, state.candidate_name, question_count)
     
     def _build_smart_context(self, state: InterviewState, memory: Optional[Dict[str, Any]], is_first: bool) -> str:
         """
@@ -215,16 +371,11 @@ End with a single QUESTION line."""
         if state.summary_so_far and len(recent_sessions) < 3:
             return state.summary_so_far
         
-        # Build compact summary from last 3 turns
-        last_3 = recent_sessions[-3:] if len(recent_sessions) >= 3 else recent_sessions
-        summary_parts = []
-        
-        for session in last_3:
-            ai_q = session.get("ai_message", "")[:100]  # Truncate
-            user_a = session.get("user_message", "")[:150]  # Truncate
-            summary_parts.append(f"Q: {ai_q}... A: {user_a}...")
-        
-        return "Recent conversation: " + " | ".join(summary_parts)
+        # Build compact summary from last 3 turns (Q truncated to 100 chars, A to 150) - bounded work per turn
+        return "Recent conversation: " + " | ".join(
+            f"Q: {session.get('ai_message', '')[:100]}... A: {session.get('user_message', '')[:150]}..."
+            for session in recent_sessions[-3:]
+        )
     
     async def generate_opening_question(
         self,
@@ -247,6 +398,7 @@ End with a single QUESTION line."""
         session_memory.candidate_name = extract_candidate_name(db_memory) if db_memory else "there"
         session_memory.stage = "intro"
         session_memory.question_count = 0
+        session_memory.duration_minutes = duration_minutes
         
         # Populate CV/JD summaries in session memory (requested by user)
         if db_memory:
@@ -266,30 +418,20 @@ End with a single QUESTION line."""
         if db_memory and db_memory.get("jd_details"):
             state.jd_requirements = extract_jd_requirements(db_memory["jd_details"])
         
-        # Build context (summaries only for first turn)
+        # Build context (summaries only for first turn) - kept in session memory for later turns
+        # An empty context (CV/JD not processed yet) isn't stored, so a later turn builds it again
         context = self._build_smart_context(state, db_memory, is_first=True)
+        session_memory.smart_context = context or None
         
         # Get stage-specific system instruction
         system_instruction = self._get_stage_system_instruction(state)
         
-        # Build simple prompt
         # Build simple prompt based on new rules
-        prompt = f"""Generate a warm, personalized opening greeting and question.
-
-Greet {session_memory.candidate_name} by name.
-Start with exactly: "I am SAI, your AI interviewer."
-Reference one concrete item from their CV/JD if available to show familiarity.
-Ask for a 60–90 second self-introduction focused on impact and responsibilities.
-Keep it friendly and professional (2-3 sentences max).
-
-Format:
-QUESTION: [your greeting and question]"""
+        prompt = _build_opening_prompt(candidate_name=session_memory.candidate_name)
 
-        # Select model based on stage (intro always uses Pro)
+        # Select model based on stage (intro always uses Pro) - passed per call, the agent is shared
         selected_model = self._select_model_for_stage(session_memory.stage)
-        if selected_model != self.model_name:
-            self.switch_model(selected_model)
-            logger.info(f"[API_CALL] Using {selected_model} for {session_memory.stage} stage")
+        logger.info("[API_CALL] Using %s for %s stage", selected_model, session_memory.stage)
         
         # Build DB memory dict (CV/JD summaries - compact)
         db_memory_dict = {}
@@ -299,18 +441,36 @@ QUESTION: [your greeting and question]"""
             if db_memory.get("jd_summary"):
                 db_memory_dict["job_requirements"] = db_memory["jd_summary"][:300]  # Compact
         
-        # Generate response using ADK with state_delta for session memory
-        question = await self.generate_response(
-            prompt=prompt,
-            system_instruction=system_instruction,
-            context=context,
-            temperature=0.6,
-            max_output_tokens=200,
-            memory=db_memory_dict,  # DB memory only (CV/JD)
-            session_id=session_run_id,  # Pass session_id to use ADK Session
-            user_id=user_id,
-            state_delta=session_memory.to_dict()  # Pass state to ADK
-        )
+        # Only greetings grounded in a CV/JD are cached - a context-free one (uploads still
+        # processing) would otherwise be replayed to every later run with no CV/JD either
+        cache_key = None
+        if context or db_memory_dict:
+            cache_key = _opening_cache_key(
+                selected_model, system_instruction, context, prompt,
+                db_memory_dict.get("candidate_cv"), db_memory_dict.get("job_requirements")
+            )
+        question = _opening_cache.get(cache_key) if cache_key else None
+        if question is not None:
+            # Cached greeting - still create the ADK session with the initial memory for later turns
+            logger.info("[API_CALL] Opening question served from cache")
+            await self._ensure_session_exists(session_run_id, user_id, initial_state=session_memory.to_dict())
+        else:
+            # Generate response using ADK with state_delta for session memory
+            question = await self.generate_response(
+                prompt=prompt,
+                system_instruction=system_instruction,
+                context=context,
+                temperature=0.6,
+                max_output_tokens=200,
+                memory=db_memory_dict,  # DB memory only (CV/JD)
+                session_id=session_run_id,  # Pass session_id to use ADK Session
+                user_id=user_id,
+                state_delta=session_memory.to_dict(),  # Pass state to ADK
+                model_name=selected_model
+            )
+            # Only cache real greetings - error fallbacks don't follow the QUESTION: format
+            if cache_key and "QUESTION:" in question:
+                _opening_cache[cache_key] = question
         
         # Get updated memory from Session.state
         updated_memory = await self.get_session_memory(session_run_id, user_id)
@@ -318,10 +478,13 @@ QUESTION: [your greeting and question]"""
         return {
             "question": question,
             "state": state.to_dict(),
-            "memory": updated_memory.to_dict() if updated_memory else session_memory.to_dict()
+            "memory": updated_memory.to_dict() if updated_memory else session_memory.to_dict(),
+            # DB summaries already loaded above - saves callers a second memory query
+            "cv_summary": db_memory.get("cv_summary") if db_memory else None,
+            "jd_summary": db_memory.get("jd_summary") if db_memory else None
         }
     
-    async def generate_follow_up_question(
+    async def _prepare_follow_up(
         self,
         interview_id: str,
         interview_title: str,
@@ -333,15 +496,23 @@ QUESTION: [your greeting and question]"""
         recent_sessions: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
-        Generate adaptive follow-up question with state machine (FIX 1, 4, 7).
-        Single LLM call - fast and efficient.
-        Reads and updates ADK Session.state each turn.
+        Load memory, advance the in-session state and build the follow-up prompt.
+        Returns {"result": ...} when the turn ends without an LLM call (time limit),
+        otherwise the pieces needed to run the generation.
         """
-        # Load DB memory (CV/JD - not in session memory)
-        db_memory = load_interview_memory(interview_id, db)
-        
-        # Get in-session memory from ADK Session.state
-        session_memory = await self.get_session_memory(session_run_id, user_id)
+        def _load_db_context():
+            # DB memory (CV/JD - not in session memory) and recent sessions if not provided
+            memory = load_interview_memory(interview_id, db)
+            if recent_sessions is None:
+                return memory, get_recent_sessions(interview_id, 5, db, session_run_id)
+            return memory, recent_sessions
+        
+        # Sync DB reads run in one worker thread (the Session isn't thread-safe), overlapping
+        # the in-session memory read from ADK Session.state
+        (db_memory, recent_sessions), session_memory = await asyncio.gather(
+            asyncio.to_thread(_load_db_context),
+            self.get_session_memory(session_run_id, user_id)
+        )
         if session_memory is None:
             # Initialize new session memory
             session_memory = InterviewMemory()
@@ -352,13 +523,14 @@ QUESTION: [your greeting and question]"""
                 session_memory.job_description = db_memory.get("jd_summary")
             self.set_session_memory(session_run_id, user_id, session_memory)
         
-        # Get interview for duration
-        interview = db.query(Interview).filter(Interview.id == interview_id).first()
-        duration_minutes = interview.duration_minutes if interview else 30
-        
-        # Load recent sessions if not provided
-        if recent_sessions is None:
-            recent_sessions = get_recent_sessions(interview_id, 5, db, session_run_id)
+        # Duration is fixed for the run - cached in session memory by the opening turn,
+        # so the DB is only asked when the memory predates that (or was re-initialized)
+        duration_minutes = session_memory.duration_minutes
+        if duration_minutes is None:
+            duration_minutes = await asyncio.to_thread(
+                lambda: db.query(Interview.duration_minutes).filter(Interview.id == interview_id).scalar()
+            ) or 30
+            session_memory.duration_minutes = duration_minutes
         
         # Update in-session memory: increment question, compute stage, update depth
         session_memory.increment_question(duration_minutes)
@@ -386,17 +558,22 @@ QUESTION: [your greeting and question]"""
         # Check time limit
         elapsed_minutes = (datetime.utcnow() - session_memory.start_time).total_seconds() / 60.0
         if elapsed_minutes >= duration_minutes:
-            logger.info(f"[TIME_LIMIT] Session exceeded {duration_minutes} mins. Ending session.")
-            return {
+            logger.info("[TIME_LIMIT] Session exceeded %s mins. Ending session.", duration_minutes)
+            return {"result": {
                 "question": "Thank you for your time. We have reached the end of our session. I'll now generate a summary of our discussion.",
                 "feedback": "Time limit reached.",
                 "state": state.to_dict(),
                 "memory": session_memory.to_dict(),
                 "end_session": True
-            }
+            }}
 
         # Build smart context (only relevant excerpts) - FIX 2
-        context = self._build_smart_context(state, db_memory, is_first=False)
+        # Depends only on the run's CV/JD memory, so it's built once and reused from session memory
+        # Empty means the CV/JD weren't ready yet - rebuild until they are
+        context = session_memory.smart_context
+        if not context:
+            context = self._build_smart_context(state, db_memory, is_first=False)
+            session_memory.smart_context = context or None
         
         # Build conversation summary (compact, not full history) - FIX 3
         conversation_summary = self._build_conversation_summary(state, recent_sessions)
@@ -405,48 +582,20 @@ QUESTION: [your greeting and question]"""
         system_instruction = self._get_stage_system_instruction(state)
         
         # Build structured prompt (FIX 5)
-        prompt = f"""Generate the next interview question and feedback.
-
-INTERVIEW CONTEXT:
-- Title: {interview_title}
-- Stage: {session_memory.stage.upper()}
-- Question #{session_memory.question_count}
-- Candidate: {session_memory.candidate_name}
-- Last Answer Depth: {session_memory.last_answer_depth:.1f}/1.0
-- Time Remaining: {max(0, duration_minutes - elapsed_minutes):.1f} mins
-
-{context}
-
-CONVERSATION SUMMARY:
-{conversation_summary}
-
-CANDIDATE'S LATEST RESPONSE:
-{user_message}
-
-TASK:
-1. Read their answer carefully.
-2. Apply the probing loop:
-   - If they just started a topic: ask for their approach/design.
-   - If they gave a high-level answer: ask about trade-offs or specific implementation details.
-   - If they gave a detailed answer: ask about edge cases or scaling.
-3. If answer was brief (depth < 0.5), probe deeper: "Can you tell me more about...?"
-4. If answer was good (depth > 0.7), acknowledge and go deeper.
-5. Reference what they just said in your next question.
-6. DO NOT REPEAT previous questions or answers.
-
-Generate:
-1. Your next question (2-3 sentences, builds on their answer)
-2. Brief, specific feedback that references something from their answer
-
-Format your response as:
-QUESTION: [your question]
-FEEDBACK: [brief feedback referencing their answer]"""
+        prompt = _build_follow_up_prompt(
+            interview_title=interview_title,
+            stage=session_memory.stage.upper(),
+            question_count=session_memory.question_count,
+            candidate_name=session_memory.candidate_name,
+            last_answer_depth=session_memory.last_answer_depth,
+            time_remaining=max(0, duration_minutes - elapsed_minutes),
+            conversation_summary=conversation_summary,
+            user_message=user_message
+        )
 
-        # Select model based on stage (follow-ups use Flash)
+        # Select model based on stage (follow-ups use Flash) - passed per call, the agent is shared
         selected_model = self._select_model_for_stage(session_memory.stage)
-        if selected_model != self.model_name:
-            self.switch_model(selected_model)
-            logger.info(f"[API_CALL] Using {selected_model} for {session_memory.stage} stage")
+        logger.info("[API_CALL] Using %s for %s stage", selected_model, session_memory.stage)
         
         # Build DB memory dict (CV/JD summaries only - compact)
         db_memory_dict = {}
@@ -456,23 +605,60 @@ FEEDBACK: [brief feedback referencing their answer]"""
             if db_memory.get("jd_summary"):
                 db_memory_dict["job_requirements"] = db_memory["jd_summary"][:300]  # Compact
         
-        # Combine context and conversation summary
-        combined_context = f"{context}\n\n{conversation_summary}" if context and conversation_summary else (context or conversation_summary or "")
+        return {
+            "state": state,
+            "session_memory": session_memory,
+            "context": context,
+            "prompt": prompt,
+            "system_instruction": system_instruction,
+            "db_memory_dict": db_memory_dict,
+            "model_name": selected_model
+        }
+    
+    @staticmethod
+    def _is_coding_turn(user_message: str, stage: str) -> bool:
+        """Whether this turn should be delegated to the CodingAgent."""
+        coding_keywords = ["write code", "function", "class", "implement", "solution", "python", "c++", "java", "code for"]
+        lowered = user_message.lower()
+        is_coding_task = any(kw in lowered for kw in coding_keywords) or "technical" in stage
+        return is_coding_task and ("code" in lowered or "function" in lowered)
+    
+    @staticmethod
+    def _parse_question_feedback(response: str):
+        """Split a QUESTION:/FEEDBACK: formatted response into (question, feedback)."""
+        # Always matches - the label, any preamble before it and the FEEDBACK: section are optional
+        match = _QUESTION_FEEDBACK_RE.match(response)
+        return match.group("question").strip(), (match.group("feedback") or "").strip() or None
+    
+    async def _follow_up_result(self, response: str, state: InterviewState, session_run_id: str, user_id: str) -> Dict[str, Any]:
+        """Build the follow-up result dict from the raw model response."""
+        question, feedback = self._parse_question_feedback(response)
         
-        try:
-            # Check for coding intent
-            coding_keywords = ["write code", "function", "class", "implement", "solution", "python", "c++", "java", "code for"]
-            is_coding_task = any(kw in user_message.lower() for kw in coding_keywords) or "technical" in session_memory.stage
-            
-            if is_coding_task and ("code" in user_message.lower() or "function" in user_message.lower()):
-                # Delegate to CodingAgent for code generation/verification
-                from .coding import CodingAgent
-                coding_agent = CodingAgent()
-                
-                # Use CodingAgent to generate response
-                # It will use tools if needed
-                response = await coding_agent.generate_response(
-                    prompt=f"""The candidate said: "{user_message}"
+        # Get updated memory from Session.state after processing
+        updated_memory = await self.get_session_memory(session_run_id, user_id)
+        
+        return {
+            "question": question,
+            "feedback": feedback,
+            "state": state.to_dict(),
+            "memory": updated_memory.to_dict() if updated_memory else None  # Return memory for client
+        }
+    
+    @staticmethod
+    def _follow_up_error_result(state: InterviewState, session_memory: InterviewMemory) -> Dict[str, Any]:
+        return {
+            "question": "I encountered a technical issue processing your request. Could you please rephrase that or shall we move to the next topic?",
+            "feedback": "System error occurred.",
+            "state": state.to_dict(),
+            "memory": session_memory.to_dict()
+        }
+    
+    async def _generate_coding_response(self, user_message: str, context: str, session_run_id: str, user_id: str, session_memory: InterviewMemory) -> str:
+        """Delegate the turn to the CodingAgent (code generation/verification)."""
+        # Use the shared CodingAgent to generate response
+        # It will use tools if needed
+        return await self.coding_agent.generate_response(
+            prompt=f"""The candidate said: "{user_message}"
                     
     Context: {context}
 
@@ -483,59 +669,128 @@ FEEDBACK: [brief feedback referencing their answer]"""
     Format your response as:
     QUESTION: [your response/question]
     FEEDBACK: [your feedback on their code/approach]""",
-                    session_id=session_run_id,
-                    user_id=user_id,
-                    state_delta=session_memory.to_dict()
+            session_id=session_run_id,
+            user_id=user_id,
+            state_delta=session_memory.to_dict()
+        )
+    
+    async def generate_follow_up_question(
+        self,
+        interview_id: str,
+        interview_title: str,
+        user_message: str,
+        db: Session,
+        session_run_id: str,
+        user_id: str,
+        state: Optional[InterviewState] = None,
+        recent_sessions: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate adaptive follow-up question with state machine (FIX 1, 4, 7).
+        Single LLM call - fast and efficient.
+        Reads and updates ADK Session.state each turn.
+        """
+        plan = await self._prepare_follow_up(
+            interview_id, interview_title, user_message, db,
+            session_run_id, user_id, state, recent_sessions
+        )
+        if "result" in plan:
+            return plan["result"]
+        
+        state = plan["state"]
+        session_memory = plan["session_memory"]
+        
+        try:
+            if self._is_coding_turn(user_message, session_memory.stage):
+                # Delegate to CodingAgent for code generation/verification
+                response = await self._generate_coding_response(
+                    user_message, plan["context"], session_run_id, user_id, session_memory
                 )
             else:
                 # Generate response using ADK with state_delta for session memory
                 response = await self.generate_response(
-                    prompt=prompt,
-                    system_instruction=system_instruction,
-                    context=combined_context,
+                    prompt=plan["prompt"],
+                    system_instruction=plan["system_instruction"],
+                    context=plan["context"],
                     temperature=0.6,
                     max_output_tokens=300,
-                    memory=db_memory_dict,  # DB memory only (CV/JD)
+                    memory=plan["db_memory_dict"],  # DB memory only (CV/JD)
                     session_id=session_run_id,  # Pass session_id to use ADK Session
                     user_id=user_id,
-                    state_delta=session_memory.to_dict()  # Pass updated state to ADK
+                    state_delta=session_memory.to_dict(),  # Pass updated state to ADK
+                    model_name=plan["model_name"]
                 )
             
-            # Parse response
-            question = response
-            feedback = None
-            
-            if "QUESTION:" in response and "FEEDBACK:" in response:
-                parts = response.split("FEEDBACK:")
-                if len(parts) == 2:
-                    question = parts[0].replace("QUESTION:", "").strip()
-                    feedback = parts[1].strip()
-            elif "FEEDBACK:" in response:
-                parts = response.split("FEEDBACK:")
-                question = parts[0].strip()
-                feedback = parts[1].strip() if len(parts) > 1 else None
+            return await self._follow_up_result(response, state, session_run_id, user_id)
+
+        except Exception as e:
+            logger.error("Error generating response: %s", e)
+            return self._follow_up_error_result(state, session_memory)
+    
+    async def stream_follow_up_question(
+        self,
+        interview_id: str,
+        interview_title: str,
+        user_message: str,
+        db: Session,
+        session_run_id: str,
+        user_id: str,
+        state: Optional[InterviewState] = None,
+        recent_sessions: Optional[List[Dict[str, Any]]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of generate_follow_up_question.
+        Yields {"type": "chunk", "text": ...} events with the question text as it arrives (QUESTION:
+        label removed, FEEDBACK: section held back), then a single {"type": "done", ...} event
+        carrying the same fields generate_follow_up_question returns.
+        Coding turns go through the (tool-using) CodingAgent and their question text arrives as one chunk.
+        """
+        plan = await self._prepare_follow_up(
+            interview_id, interview_title, user_message, db,
+            session_run_id, user_id, state, recent_sessions
+        )
+        if "result" in plan:
+            yield {"type": "done", **plan["result"]}
+            return
+        
+        state = plan["state"]
+        session_memory = plan["session_memory"]
+        
+        try:
+            if self._is_coding_turn(user_message, session_memory.stage):
+                response = await self._generate_coding_response(
+                    user_message, plan["context"], session_run_id, user_id, session_memory
+                )
+                # Same chunk contract as normal turns - question text only
+                yield {"type": "chunk", "text": self._parse_question_feedback(response)[0]}
             else:
-                # If no feedback section, use entire response as question
-                question = response
-            
-            # Get updated memory from Session.state after processing
-            updated_memory = await self.get_session_memory(session_run_id, user_id)
+                chunks = []
+                question_stream = _QuestionStream()
+                async for chunk in self.stream_response(
+                    prompt=plan["prompt"],
+                    system_instruction=plan["system_instruction"],
+                    context=plan["context"],
+                    memory=plan["db_memory_dict"],
+                    session_id=session_run_id,
+                    user_id=user_id,
+                    state_delta=session_memory.to_dict(),
+                    model_name=plan["model_name"]
+                ):
+                    chunks.append(chunk)
+                    text = question_stream.feed(chunk)
+                    if text:
+                        yield {"type": "chunk", "text": text}
+                text = question_stream.finish()
+                if text:
+                    yield {"type": "chunk", "text": text}
+                response = "".join(chunks).strip()
             
-            return {
-                "question": question,
-                "feedback": feedback,
-                "state": state.to_dict(),
-                "memory": updated_memory.to_dict() if updated_memory else None  # Return memory for client
-            }
-
+            result = await self._follow_up_result(response, state, session_run_id, user_id)
         except Exception as e:
-            logger.error(f"Error generating response: {e}")
-            return {
-                "question": "I encountered a technical issue processing your request. Could you please rephrase that or shall we move to the next topic?",
-                "feedback": "System error occurred.",
-                "state": state.to_dict(),
-                "memory": session_memory.to_dict()
-            }
+            logger.error("Error streaming response: %s", e)
+            result = self._follow_up_error_result(state, session_memory)
+        
+        yield {"type": "done", **result}
     
     def should_escalate_to_pro(self, task_type: str, complexity: str) -> bool:
         """
@@ -556,7 +811,7 @@ FEEDBACK: [brief feedback referencing their answer]"""
             session_memory = await self.get_session_memory(session_run_id, user_id)
             if not session_memory:
                 return "No session data available."
-                
+            
             prompt = f"""Generate a comprehensive performance summary for the candidate based on the session.
             
             Candidate: {session_memory.candidate_name}
@@ -576,9 +831,10 @@ FEEDBACK: [brief feedback referencing their answer]"""
             summary = await self.generate_response(
                 prompt=prompt,
                 temperature=0.7,
-                max_output_tokens=500
+                max_output_tokens=500,
+                request_timeout=self.request_timeout
             )
             return summary
         except Exception as e:
-            logger.error(f"Error generating summary: {e}")
+            logger.error("Error generating summary: %s", e)
             return "Could not generate summary due to an error."
@@ -1,47 +1,62 @@
 """
 Interview Memory - In-session memory for interview state tracking
-Pydantic BaseModel for ADK compatibility (< 5 KB), session-only (not persisted to DB)
+Slotted dataclass synced to ADK session state each turn (< 5 KB), session-only (not persisted to DB)
 """
 from typing import Dict, Any, List, Optional
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 import json
 
 
-class InterviewMemory(BaseModel):
+@dataclass(slots=True)
+class InterviewMemory:
     """
-    In-session memory object for interview state (ADK-compatible Pydantic model).
+    In-session memory object for interview state (synced to ADK Session.state).
     Lives only during the session, not persisted to DB.
     Kept under 5 KB - only summaries and scalars.
     """
-    stage: str = Field(default="intro", description="Interview stage: intro → technical → behavioral → closing")
-    question_count: int = Field(default=0, description="Number of questions asked")
-    last_answer_depth: float = Field(default=0.5, description="Depth score of last answer (0.0-1.0)")
-    topics_covered: List[str] = Field(default_factory=list, description="List of topics covered")
-    candidate_name: str = Field(default="there", description="Candidate's name")
-    cv_summary: Optional[str] = Field(default=None, description="Summary of the candidate's CV")
-    job_description: Optional[str] = Field(default=None, description="The job description")
-    start_time: datetime = Field(default_factory=datetime.utcnow, description="Session start time")
-    duration_minutes: int = Field(default=30, description="Total interview duration in minutes")
-    
-    class Config:
-        """Pydantic config for ADK compatibility."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    stage: str = "intro"  # Interview stage: intro → technical → behavioral → closing
+    question_count: int = 0  # Number of questions asked
+    last_answer_depth: float = 0.5  # Depth score of last answer (0.0-1.0)
+    topics_covered: List[str] = field(default_factory=list)  # List of topics covered
+    candidate_name: str = "there"  # Candidate's name
+    cv_summary: Optional[str] = None  # Summary of the candidate's CV
+    job_description: Optional[str] = None  # The job description
+    start_time: datetime = field(default_factory=datetime.utcnow)  # Session start time
+    duration_minutes: Optional[int] = None  # Total interview duration in minutes (set by the opening turn)
+    smart_context: Optional[str] = None  # Compressed CV/JD context (< 500 chars), built once per run
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary (Pydantic method)."""
-        return self.model_dump(exclude_none=True)
+        """Convert to dictionary (None fields omitted)."""
+        data = {
+            "stage": self.stage,
+            "question_count": self.question_count,
+            "last_answer_depth": self.last_answer_depth,
+            "topics_covered": list(self.topics_covered),
+            "candidate_name": self.candidate_name,
+            "start_time": self.start_time.isoformat(),  # JSON-safe for persistent session services
+        }
+        if self.duration_minutes is not None:
+            data["duration_minutes"] = self.duration_minutes
+        if self.smart_context is not None:
+            data["smart_context"] = self.smart_context
+        if self.cv_summary is not None:
+            data["cv_summary"] = self.cv_summary
+        if self.job_description is not None:
+            data["job_description"] = self.job_description
+        return data
     
     def to_json(self) -> str:
         """Convert to JSON string for context passing."""
-        return self.model_dump_json(exclude_none=True)
+        return json.dumps(self.to_dict(), separators=(",", ":"))
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "InterviewMemory":
-        """Load from dictionary (Pydantic method)."""
-        return cls(**data)
+        """Load from dictionary (e.g. ADK Session.state) - unknown keys are ignored."""
+        values = {k: data[k] for k in _FIELDS if k in data}
+        if isinstance(values.get("start_time"), str):
+            values["start_time"] = datetime.fromisoformat(values["start_time"])
+        return cls(**values)
     
     def update_stage(self, duration_minutes: int = 30):
         """Update stage based on elapsed time and question count."""
@@ -88,3 +103,5 @@ class InterviewMemory(BaseModel):
         json_str = self.to_json()
         return len(json_str.encode('utf-8')) / 1024.0
 
+
+_FIELDS = tuple(f.name for f in fields(InterviewMemory))
@@ -6,6 +6,7 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
+from src.utils.logger import logger
 
 load_dotenv()
 
@@ -24,6 +25,8 @@ engine = create_engine(
     pool_pre_ping=True,  # Verify connections before using
     pool_size=5,
     max_overflow=10,
+    query_cache_size=1200,  # Compiled statement cache (default 500)
+    future=True,
 )
 
 # Create session factory
@@ -59,11 +62,11 @@ def init_db():
             conn.execute(text("DROP TABLE IF EXISTS sessions CASCADE"))
             conn.commit()
     except Exception as e:
-        print(f"Note: Could not drop old tables (they may not exist): {e}")
+        logger.info("Could not drop old tables (they may not exist): %s", e)
     
     # Create all tables
     Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully")
+    logger.info("Database tables created successfully")
     
     # Run migrations
     try:
@@ -77,7 +80,7 @@ def init_db():
             """))
             
             if result.fetchone() is None:
-                print("Running migration: Adding session_run_id column...")
+                logger.info("Running migration: Adding session_run_id column...")
                 conn.execute(text("""
                     ALTER TABLE interview_sessions 
                     ADD COLUMN session_run_id UUID
@@ -97,10 +100,39 @@ def init_db():
                 """))
                 
                 conn.commit()
-                print("Migration completed: session_run_id column added")
+                logger.info("Migration completed: session_run_id column added")
             else:
-                print("Migration skipped: session_run_id column already exists")
+                logger.info("Migration skipped: session_run_id column already exists")
+            
+            # Migration: Add background processing status columns to interview_memory
+            conn.execute(text("""
+                ALTER TABLE interview_memory 
+                ADD COLUMN IF NOT EXISTS cv_status VARCHAR
+            """))
+            conn.execute(text("""
+                ALTER TABLE interview_memory 
+                ADD COLUMN IF NOT EXISTS jd_status VARCHAR
+            """))
+            conn.execute(text("""
+                ALTER TABLE interview_memory 
+                ADD COLUMN IF NOT EXISTS cv_status_at TIMESTAMPTZ
+            """))
+            conn.execute(text("""
+                ALTER TABLE interview_memory 
+                ADD COLUMN IF NOT EXISTS jd_status_at TIMESTAMPTZ
+            """))
+            
+            # Migration: Composite indexes for session history queries (filter + ORDER BY created_at)
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_sessions_interview_run_created 
+                ON interview_sessions(interview_id, session_run_id, created_at)
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_sessions_interview_created 
+                ON interview_sessions(interview_id, created_at)
+            """))
+            conn.commit()
     except Exception as e:
-        print(f"Warning: Migration failed (column may already exist): {e}")
+        logger.warning("Migration failed (column may already exist): %s", e)
         # Don't fail if migration fails - column might already exist
 
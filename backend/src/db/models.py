@@ -1,22 +1,30 @@
 """
 Database models - Matches existing Neon DB schema
 """
-from sqlalchemy import Column, String, DateTime, Integer, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, Integer, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 from .config import Base
 
 
+def utcnow() -> datetime:
+    """
+    Timezone-aware current UTC time - the one clock for all timestamp columns
+    Naive values on DateTime(timezone=True) columns are read in the database server's timezone
+    """
+    return datetime.now(timezone.utc)
+
+
 class User(Base):
     """User model - matches existing schema with user_id as Clerk ID"""
     __tablename__ = "users"
 
     user_id = Column(String, primary_key=True)  # Clerk user ID (e.g., "user_2abc123")
     email = Column(String, nullable=False, index=True)
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utcnow, nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow, nullable=False)
 
     # Relationships
     interviews = relationship("Interview", back_populates="user", cascade="all, delete-orphan")
@@ -42,7 +50,7 @@ class Interview(Base):
     duration_minutes = Column(Integer, default=30, nullable=False)
     job_description = Column(Text, nullable=True)  # LLM-generated summary (full details in interview_memory)
     cv_summary = Column(Text, nullable=True)  # LLM-generated summary (full details in interview_memory)
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utcnow, nullable=False)
 
     # Relationships
     user = relationship("User", back_populates="interviews")
@@ -67,6 +75,12 @@ class InterviewSession(Base):
     for the same interview preparation.
     """
     __tablename__ = "interview_sessions"
+    __table_args__ = (
+        # Serves "sessions for a run, ordered by time" without a sort step
+        Index("ix_sessions_interview_run_created", "interview_id", "session_run_id", "created_at"),
+        # Serves "all sessions / latest session for an interview" (no run filter)
+        Index("ix_sessions_interview_created", "interview_id", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     interview_id = Column(UUID(as_uuid=True), ForeignKey("interviews.id"), nullable=False)
@@ -74,7 +88,7 @@ class InterviewSession(Base):
     ai_message = Column(Text, nullable=False)  # Question or response from AI
     user_message = Column(Text, nullable=False)  # Candidate's response
     feedback = Column(Text, nullable=True)  # AI evaluation of that response
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utcnow, nullable=False)
 
     # Relationships
     interview = relationship("Interview", back_populates="sessions")
@@ -106,8 +120,14 @@ class InterviewMemory(Base):
     jd_summary = Column(Text, nullable=True)  # LLM-generated summary
     jd_details = Column(JSONB, nullable=True)  # Structured requirements (skills needed, experience, etc.)
     
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Background processing status: pending | ready | failed, and when each was last set
+    cv_status = Column(String, nullable=True)
+    jd_status = Column(String, nullable=True)
+    cv_status_at = Column(DateTime(timezone=True), nullable=True)
+    jd_status_at = Column(DateTime(timezone=True), nullable=True)
+    
+    created_at = Column(DateTime(timezone=True), default=utcnow, nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow, nullable=False)
 
     # Relationships
     interview = relationship("Interview", back_populates="memory")
@@ -120,6 +140,8 @@ class InterviewMemory(Base):
             "cv_details": self.cv_details,
             "jd_summary": self.jd_summary,
             "jd_details": self.jd_details,
+            "cv_status": self.cv_status,
+            "jd_status": self.jd_status,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
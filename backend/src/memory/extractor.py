@@ -1,24 +1,71 @@
 """
 Memory Extractor - Extract structured information from CV/JD using LLM
 """
+import asyncio
 import fitz  # PyMuPDF
 import os
 import json
-from typing import Dict, Optional
+import threading
+import hashlib
+from typing import Any, Callable, Dict, Optional, Union
 import google.generativeai as genai
+from cachetools import TTLCache
+from src.utils.logger import logger
 
+# Plain-text extraction in reading order, with hyphenated line breaks joined by MuPDF
+PDF_TEXT_FLAGS = fitz.TEXTFLAGS_TEXT | fitz.TEXT_DEHYPHENATE
 
-def extract_text_from_pdf(file_path: str) -> str:
+# Page limits for uploaded documents - CVs/JDs beyond this are rejected up front
+MAX_PAGES_CV = int(os.getenv("MAX_PAGES_CV", "10"))
+MAX_PAGES_JD = int(os.getenv("MAX_PAGES_JD", "5"))
+
+# Cache of successful LLM results keyed by prompt hash (exact match)
+# The same CV/JD is commonly uploaded again for a new interview - reuse the summary/details
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+_llm_result_cache: TTLCache = TTLCache(maxsize=256, ttl=LLM_CACHE_TTL_SECONDS)
+
+# In-flight LLM calls keyed by prompt hash - identical concurrent prompts share one Gemini request
+_inflight_llm_calls: Dict[str, asyncio.Task] = {}
+
+# Shared Gemini model instances, keyed by model name (see get_gemini_model)
+_gemini_models: Dict[str, "genai.GenerativeModel"] = {}
+_gemini_models_lock = threading.Lock()
+
+
+def _open_pdf(source: Union[str, bytes]) -> "fitz.Document":
+    """Open a PDF from a file path or from in-memory bytes"""
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+
+def get_pdf_page_count(source: Union[str, bytes]) -> int:
     """
-    Extract text from PDF file using PyMuPDF
+    Get the number of pages in a PDF without extracting any text
+    Returns 0 if the PDF cannot be opened
     """
     try:
-        doc = fitz.open(file_path)
-        text = "\n\n".join([page.get_text() for page in doc])
-        doc.close()
-        return text.strip()
+        with _open_pdf(source) as doc:
+            return doc.page_count
     except Exception as e:
-        print(f"Error extracting text from PDF: {e}")
+        logger.error("Error reading PDF page count: %s", e)
+        return 0
+
+
+def extract_text_from_pdf(source: Union[str, bytes], max_pages: Optional[int] = None) -> str:
+    """
+    Extract text from PDF using PyMuPDF
+    Accepts a file path or the raw PDF bytes (avoids re-reading an upload from disk)
+    Stops after max_pages pages if given
+    Uploads are capped at a few pages, so extraction is serial - it takes milliseconds
+    """
+    try:
+        with _open_pdf(source) as doc:
+            page_count = doc.page_count if max_pages is None else min(doc.page_count, max_pages)
+            parts = [doc[i].get_text("text", sort=True, flags=PDF_TEXT_FLAGS) for i in range(page_count)]
+        return "\n\n".join(parts).strip()
+    except Exception as e:
+        logger.error("Error extracting text from PDF: %s", e)
         return ""
 
 
@@ -30,31 +77,92 @@ def extract_text_from_txt(file_path: str) -> str:
         with open(file_path, 'r', encoding='utf-8') as f:
             return f.read().strip()
     except Exception as e:
-        print(f"Error extracting text from TXT: {e}")
+        logger.error("Error extracting text from TXT: %s", e)
         return ""
 
 
-def get_gemini_model():
-    """Get Gemini model instance"""
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not found in environment variables")
+def get_gemini_model(model_name: str = "gemini-2.0-flash"):
+    """
+    Get the shared Gemini model instance for model_name
+    Configured and created once per process, then reused by every extraction call
+    """
+    model = _gemini_models.get(model_name)
+    if model is None:
+        with _gemini_models_lock:
+            model = _gemini_models.get(model_name)
+            if model is None:
+                api_key = os.getenv("GEMINI_API_KEY")
+                if not api_key:
+                    raise ValueError("GEMINI_API_KEY not found in environment variables")
+                
+                genai.configure(api_key=api_key)
+                model = _gemini_models[model_name] = genai.GenerativeModel(model_name)
+    return model
+
+
+def _prompt_key(prompt: str) -> str:
+    """Cache key for an LLM prompt"""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+async def _agenerate_uncached(prompt: str, parse: Callable[[str], Any], key: str) -> Any:
+    model = get_gemini_model()
+    response = await model.generate_content_async(prompt)
+    result = parse(response.text)
+    _llm_result_cache[key] = result
+    return result
+
+
+def _finish_inflight(key: str, task: asyncio.Task):
+    """Done-callback for a shared LLM call: drop it from the in-flight map and consume its exception"""
+    if _inflight_llm_calls.get(key) is task:
+        del _inflight_llm_calls[key]
+    # If every waiter was cancelled nobody awaits the task - retrieve the error so asyncio doesn't log
+    # "Task exception was never retrieved"
+    if not task.cancelled():
+        task.exception()
+
+
+async def _agenerate(prompt: str, parse: Callable[[str], Any]) -> Any:
+    """
+    Run a Gemini prompt and parse the response text, via the result cache
+    Identical concurrent prompts await the same in-flight request instead of issuing their own
+    """
+    key = _prompt_key(prompt)
+    cached = _llm_result_cache.get(key)
+    if cached is not None:
+        return cached
     
-    genai.configure(api_key=api_key)
-    return genai.GenerativeModel('gemini-2.0-flash')
+    task = _inflight_llm_calls.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_agenerate_uncached(prompt, parse, key))
+        _inflight_llm_calls[key] = task
+        task.add_done_callback(lambda t: _finish_inflight(key, t))
+    # shield: one caller being cancelled must not cancel the shared request
+    return await asyncio.shield(task)
 
 
-def generate_cv_summary(cv_text: str) -> str:
+def _parse_json_response(text: str) -> Dict:
     """
-    Generate a concise CV summary using Gemini
+    Parse JSON returned by the LLM, stripping markdown code blocks if present
     """
-    if not cv_text:
-        return None
+    text = text.strip()
     
-    try:
-        model = get_gemini_model()
-        
-        prompt = f"""Summarize this CV in 10-15 lines, highlighting:
+    # Clean up response (remove markdown code blocks if present)
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    text = text.strip()
+    
+    # Parse JSON
+    return json.loads(text)
+
+
+def _cv_summary_prompt(cv_text: str) -> str:
+    return f"""Summarize this CV in 10-15 lines, highlighting:
 - Professional background
 - Key skills and expertise
 - Years of experience
@@ -65,26 +173,24 @@ CV Content:
 {cv_text[:4000]}
 
 Summary:"""
-        
-        response = model.generate_content(prompt)
-        return response.text.strip()
-    except Exception as e:
-        print(f"Error generating CV summary: {e}")
-        return None
 
 
-def extract_cv_details(cv_text: str) -> Optional[Dict]:
+async def agenerate_cv_summary(cv_text: str) -> str:
     """
-    Extract structured information from CV using Gemini
-    Returns JSON with all key details
+    Generate a concise CV summary using Gemini's async client
     """
     if not cv_text:
         return None
     
     try:
-        model = get_gemini_model()
-        
-        prompt = f"""Extract structured information from this CV and return ONLY valid JSON (no markdown, no code blocks, just JSON):
+        return await _agenerate(_cv_summary_prompt(cv_text), str.strip)
+    except Exception as e:
+        logger.error("Error generating CV summary: %s", e)
+        return None
+
+
+def _cv_details_prompt(cv_text: str) -> str:
+    return f"""Extract structured information from this CV and return ONLY valid JSON (no markdown, no code blocks, just JSON):
 
 {{
   "name": "",
@@ -129,41 +235,29 @@ CV Content:
 {cv_text[:6000]}
 
 Return only the JSON object:"""
-        
-        response = model.generate_content(prompt)
-        text = response.text.strip()
-        
-        # Clean up response (remove markdown code blocks if present)
-        if text.startswith("```json"):
-            text = text[7:]
-        if text.startswith("```"):
-            text = text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
-        text = text.strip()
-        
-        # Parse JSON
-        return json.loads(text)
-    except json.JSONDecodeError as e:
-        print(f"Error parsing CV JSON: {e}")
-        print(f"Response was: {response.text[:500]}")
-        return None
-    except Exception as e:
-        print(f"Error extracting CV details: {e}")
-        return None
 
 
-def generate_jd_summary(jd_text: str) -> str:
+async def aextract_cv_details(cv_text: str) -> Optional[Dict]:
     """
-    Generate a concise JD summary using Gemini
+    Extract structured information from CV using Gemini's async client
+    Returns JSON with all key details
     """
-    if not jd_text:
+    if not cv_text:
         return None
     
     try:
-        model = get_gemini_model()
-        
-        prompt = f"""Summarize this job description in 10-15 lines, highlighting:
+        return await _agenerate(_cv_details_prompt(cv_text), _parse_json_response)
+    except json.JSONDecodeError as e:
+        logger.error("Error parsing CV JSON: %s", e)
+        logger.error("Response was: %s", e.doc[:500])
+        return None
+    except Exception as e:
+        logger.error("Error extracting CV details: %s", e)
+        return None
+
+
+def _jd_summary_prompt(jd_text: str) -> str:
+    return f"""Summarize this job description in 10-15 lines, highlighting:
 - Job title and role
 - Key responsibilities
 - Required experience level
@@ -174,26 +268,24 @@ Job Description:
 {jd_text[:4000]}
 
 Summary:"""
-        
-        response = model.generate_content(prompt)
-        return response.text.strip()
-    except Exception as e:
-        print(f"Error generating JD summary: {e}")
-        return None
 
 
-def extract_jd_details(jd_text: str) -> Optional[Dict]:
+async def agenerate_jd_summary(jd_text: str) -> str:
     """
-    Extract structured requirements from JD using Gemini
-    Returns JSON with all key requirements
+    Generate a concise JD summary using Gemini's async client
     """
     if not jd_text:
         return None
     
     try:
-        model = get_gemini_model()
-        
-        prompt = f"""Extract structured job requirements from this job description and return ONLY valid JSON (no markdown, no code blocks, just JSON):
+        return await _agenerate(_jd_summary_prompt(jd_text), str.strip)
+    except Exception as e:
+        logger.error("Error generating JD summary: %s", e)
+        return None
+
+
+def _jd_details_prompt(jd_text: str) -> str:
+    return f"""Extract structured job requirements from this job description and return ONLY valid JSON (no markdown, no code blocks, just JSON):
 
 {{
   "role": "",
@@ -227,26 +319,23 @@ Job Description:
 {jd_text[:6000]}
 
 Return only the JSON object:"""
-        
-        response = model.generate_content(prompt)
-        text = response.text.strip()
-        
-        # Clean up response (remove markdown code blocks if present)
-        if text.startswith("```json"):
-            text = text[7:]
-        if text.startswith("```"):
-            text = text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
-        text = text.strip()
-        
-        # Parse JSON
-        return json.loads(text)
+
+
+async def aextract_jd_details(jd_text: str) -> Optional[Dict]:
+    """
+    Extract structured requirements from JD using Gemini's async client
+    Returns JSON with all key requirements
+    """
+    if not jd_text:
+        return None
+    
+    try:
+        return await _agenerate(_jd_details_prompt(jd_text), _parse_json_response)
     except json.JSONDecodeError as e:
-        print(f"Error parsing JD JSON: {e}")
-        print(f"Response was: {response.text[:500]}")
+        logger.error("Error parsing JD JSON: %s", e)
+        logger.error("Response was: %s", e.doc[:500])
         return None
     except Exception as e:
-        print(f"Error extracting JD details: {e}")
+        logger.error("Error extracting JD details: %s", e)
         return None
 
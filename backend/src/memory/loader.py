@@ -1,6 +1,7 @@
 """
 Memory Loader - Loads and formats interview memory for agent context
 """
+import uuid
 from typing import Dict, Any, Optional, List
 from sqlalchemy.orm import Session
 from src.db.models import InterviewMemory, InterviewSession, Interview
@@ -182,7 +183,6 @@ def get_recent_sessions(interview_id: str, limit: int, db: Session, session_run_
     # Filter by session_run_id if provided
     if session_run_id:
         try:
-            import uuid
             run_uuid = uuid.UUID(session_run_id)
             query = query.filter(InterviewSession.session_run_id == run_uuid)
         except ValueError:
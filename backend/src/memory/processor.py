@@ -0,0 +1,226 @@
+"""
+Upload Processor - Background CV/JD processing for uploaded files
+Runs text extraction and LLM summarization off the request path
+"""
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from src.db.config import SessionLocal
+from src.db.models import Interview, InterviewMemory, utcnow
+from src.utils.logger import logger
+from .extractor import (
+    extract_text_from_pdf,
+    MAX_PAGES_CV,
+    MAX_PAGES_JD,
+    aextract_cv_details,
+    aextract_jd_details,
+    agenerate_cv_summary,
+    agenerate_jd_summary
+)
+
+# Processing status values stored on interview_memory.cv_status / jd_status
+STATUS_PENDING = "pending"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+
+# A job runs in-process (BackgroundTasks), so a worker restart loses it and its status stays pending
+# Pending older than this is reported as failed - the user can upload again
+PROCESSING_STALE_SECONDS = int(os.getenv("PROCESSING_STALE_SECONDS", "300"))
+
+
+class ProcessingStatus(NamedTuple):
+    """Effective CV/JD processing status (None if never uploaded)"""
+    cv_status: Optional[str]
+    jd_status: Optional[str]
+
+
+def _upsert_memory(db: Session, interview_id, **fields):
+    """
+    Insert or update the interview memory row in a single statement
+    Uses INSERT ... ON CONFLICT (interview_id) DO UPDATE - does not commit
+    """
+    fields["updated_at"] = utcnow()
+    stmt = insert(InterviewMemory).values(interview_id=interview_id, **fields).on_conflict_do_update(
+        index_elements=[InterviewMemory.interview_id],
+        set_=fields
+    )
+    db.execute(stmt)
+
+
+def set_processing_status(db: Session, interview_id, cv_status: Optional[str] = None, jd_status: Optional[str] = None):
+    """
+    Update CV and/or JD processing status (and its timestamp) for an interview
+    Blocking DB work - call from a worker thread in async code
+    """
+    now = utcnow()
+    fields = {}
+    if cv_status is not None:
+        fields["cv_status"] = cv_status
+        fields["cv_status_at"] = now
+    if jd_status is not None:
+        fields["jd_status"] = jd_status
+        fields["jd_status_at"] = now
+    _upsert_memory(db, interview_id, **fields)
+    db.commit()
+
+
+def _effective_status(status: Optional[str], status_at: Optional[datetime], now: datetime) -> Optional[str]:
+    """A pending status whose job can no longer be running counts as failed"""
+    if status == STATUS_PENDING and (
+        status_at is None or now - status_at > timedelta(seconds=PROCESSING_STALE_SECONDS)
+    ):
+        return STATUS_FAILED
+    return status
+
+
+def get_processing_status_row(db: Session, interview_id) -> Optional[ProcessingStatus]:
+    """
+    Fetch the effective (cv_status, jd_status) for an interview, or None if no memory row exists yet
+    Column projection so repeated polls always read fresh values
+    Blocking DB work - call from a worker thread in async code
+    """
+    row = db.query(
+        InterviewMemory.cv_status,
+        InterviewMemory.cv_status_at,
+        InterviewMemory.jd_status,
+        InterviewMemory.jd_status_at
+    ).filter(InterviewMemory.interview_id == interview_id).first()
+    if row is None:
+        return None
+    now = utcnow()
+    return ProcessingStatus(
+        _effective_status(row.cv_status, row.cv_status_at, now),
+        _effective_status(row.jd_status, row.jd_status_at, now)
+    )
+
+
+def _mark_status(interview_id, **statuses):
+    """Background jobs: set a processing status using a short-lived DB session (blocking)"""
+    db = SessionLocal()
+    try:
+        set_processing_status(db, interview_id, **statuses)
+    finally:
+        db.close()
+
+
+def _save_cv(interview_id, cv_summary: str, cv_details: dict):
+    """Store CV summary/details in memory and on the interview - single commit (blocking)"""
+    db = SessionLocal()
+    try:
+        _upsert_memory(
+            db, interview_id,
+            cv_summary=cv_summary, cv_details=cv_details, cv_status=STATUS_READY, cv_status_at=utcnow()
+        )
+        # Also update interview record with summary for backward compatibility
+        db.query(Interview).filter(Interview.id == interview_id).update(
+            {Interview.cv_summary: cv_summary}, synchronize_session=False
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _save_jd(interview_id, jd_summary: str, jd_details: dict):
+    """Store JD summary/details in memory and on the interview - single commit (blocking)"""
+    db = SessionLocal()
+    try:
+        _upsert_memory(
+            db, interview_id,
+            jd_summary=jd_summary, jd_details=jd_details, jd_status=STATUS_READY, jd_status_at=utcnow()
+        )
+        # Also update interview record with summary for backward compatibility
+        # Store summary instead of full text
+        db.query(Interview).filter(Interview.id == interview_id).update(
+            {Interview.job_description: jd_summary}, synchronize_session=False
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def process_cv(interview_id, pdf_bytes: bytes):
+    """
+    Background job: extract CV text from the uploaded PDF bytes, generate summary/details and store them in memory
+    PDF extraction and DB writes run in worker threads and LLM calls use the async client
+    """
+    try:
+        cv_text = await asyncio.to_thread(extract_text_from_pdf, pdf_bytes, MAX_PAGES_CV)
+        if not cv_text:
+            logger.warning("Failed to extract text from CV for interview %s", interview_id)
+            await asyncio.to_thread(_mark_status, interview_id, cv_status=STATUS_FAILED)
+            return
+
+        logger.info("Processing CV for interview %s...", interview_id)
+
+        # Summary and details are independent LLM calls - run them concurrently
+        cv_summary, cv_details = await asyncio.gather(
+            agenerate_cv_summary(cv_text),
+            aextract_cv_details(cv_text)
+        )
+
+        # The async helpers return None on LLM errors - keep the previous CV data instead of overwriting it
+        if cv_summary is None or cv_details is None:
+            logger.warning("CV summarization failed for interview %s", interview_id)
+            await asyncio.to_thread(_mark_status, interview_id, cv_status=STATUS_FAILED)
+            return
+
+        await asyncio.to_thread(_save_cv, interview_id, cv_summary, cv_details)
+    except Exception as e:
+        logger.error("Error processing CV for interview %s: %s", interview_id, e)
+        await asyncio.to_thread(_mark_status, interview_id, cv_status=STATUS_FAILED)
+
+
+async def _store_jd(interview_id, jd_text: str):
+    """Generate JD summary/details and store them in memory"""
+    # Summary and details are independent LLM calls - run them concurrently
+    jd_summary, jd_details = await asyncio.gather(
+        agenerate_jd_summary(jd_text),
+        aextract_jd_details(jd_text)
+    )
+
+    # The async helpers return None on LLM errors - keep the previous JD data instead of overwriting it
+    if jd_summary is None or jd_details is None:
+        logger.warning("JD summarization failed for interview %s", interview_id)
+        await asyncio.to_thread(_mark_status, interview_id, jd_status=STATUS_FAILED)
+        return
+
+    await asyncio.to_thread(_save_jd, interview_id, jd_summary, jd_details)
+
+
+async def process_jd_file(interview_id, pdf_bytes: bytes):
+    """
+    Background job: extract JD text from the uploaded PDF bytes and process it
+    """
+    try:
+        jd_text = await asyncio.to_thread(extract_text_from_pdf, pdf_bytes, MAX_PAGES_JD)
+        if not jd_text:
+            logger.warning("Failed to extract text from JD for interview %s", interview_id)
+            await asyncio.to_thread(_mark_status, interview_id, jd_status=STATUS_FAILED)
+            return
+
+        logger.info("Processing JD for interview %s...", interview_id)
+        await _store_jd(interview_id, jd_text)
+    except Exception as e:
+        logger.error("Error processing JD for interview %s: %s", interview_id, e)
+        await asyncio.to_thread(_mark_status, interview_id, jd_status=STATUS_FAILED)
+
+
+async def process_jd_from_text(interview_id, jd_text: str):
+    """
+    Background job: process job description text (from textarea)
+    """
+    try:
+        logger.info("Processing JD text for interview %s...", interview_id)
+        await _store_jd(interview_id, jd_text)
+    except Exception as e:
+        logger.error("Error processing JD text for interview %s: %s", interview_id, e)
+        await asyncio.to_thread(_mark_status, interview_id, jd_status=STATUS_FAILED)
@@ -5,7 +5,6 @@ Executes code in various languages (Python, C++, C, Java) safely.
 import aiohttp
 import json
 from typing import Dict, Any, Optional
-from google.adk.tools import FunctionTool
 
 async def execute_code(language: str, code: str, stdin: str = "") -> str:
     """
@@ -71,4 +70,6 @@ async def execute_code(language: str, code: str, stdin: str = "") -> str:
 
 def get_code_execution_tool():
     """Returns the ADK FunctionTool for code execution."""
+    # Imported here so importing this module (via CodingAgent) doesn't load google.adk
+    from google.adk.tools import FunctionTool
     return FunctionTool(execute_code)
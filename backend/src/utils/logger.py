@@ -14,9 +14,12 @@ LOG_DIR.mkdir(exist_ok=True)
 # Log file path
 LOG_FILE = LOG_DIR / "app.log"
 
+# Log level - set LOG_LEVEL=DEBUG for verbose request/agent tracing
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
 # Configure logging
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=LOG_LEVEL,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.FileHandler(LOG_FILE),
@@ -28,21 +31,25 @@ logger = logging.getLogger("sai_interviewer")
 
 def log_api_call(agent_name: str, prompt: str, response: Any, error: Optional[Exception] = None):
     """Log API call details"""
-    logger.debug(f"[API_CALL] Agent: {agent_name}")
-    logger.debug(f"[API_CALL] Prompt length: {len(prompt)}")
-    logger.debug(f"[API_CALL] Prompt preview: {prompt[:500]}...")
-    
     if error:
-        logger.error(f"[API_CALL] Error: {error}")
-    else:
-        logger.debug(f"[API_CALL] Response type: {type(response)}")
+        logger.error("[API_CALL] Error: %s", error)
+    
+    # Everything else is debug detail - skip the slicing/str() work entirely unless DEBUG is on
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    
+    logger.debug("[API_CALL] Agent: %s", agent_name)
+    logger.debug("[API_CALL] Prompt length: %d", len(prompt))
+    logger.debug("[API_CALL] Prompt preview: %s...", prompt[:500])
+    
+    if not error:
+        logger.debug("[API_CALL] Response type: %s", type(response))
         if hasattr(response, 'candidates'):
-            logger.debug(f"[API_CALL] Candidates count: {len(response.candidates) if response.candidates else 0}")
+            logger.debug("[API_CALL] Candidates count: %d", len(response.candidates) if response.candidates else 0)
             if response.candidates and len(response.candidates) > 0:
                 candidate = response.candidates[0]
-                logger.debug(f"[API_CALL] Finish reason: {candidate.finish_reason}")
-                logger.debug(f"[API_CALL] Has content: {candidate.content is not None}")
+                logger.debug("[API_CALL] Finish reason: %s", candidate.finish_reason)
+                logger.debug("[API_CALL] Has content: %s", candidate.content is not None)
                 if candidate.content:
-                    logger.debug(f"[API_CALL] Parts count: {len(candidate.content.parts) if candidate.content.parts else 0}")
-        logger.debug(f"[API_CALL] Full response object: {response}")
-
+                    logger.debug("[API_CALL] Parts count: %d", len(candidate.content.parts) if candidate.content.parts else 0)
+        logger.debug("[API_CALL] Full response object: %s", response)
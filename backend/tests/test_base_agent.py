@@ -0,0 +1,154 @@
+"""
+BaseAgent.generate_response retry/timeout behaviour
+Runs without google.adk - the session service and the ADK run are faked
+"""
+import asyncio
+import unittest
+from unittest import mock
+
+from src.agents import base
+
+
+class FakeSessionService:
+    """Records deleted sessions - enough for _discard_session"""
+
+    def __init__(self):
+        self.deleted = []
+
+    async def delete_session(self, app_name, user_id, session_id):
+        self.deleted.append(session_id)
+
+
+class ScriptedAgent(base.BaseAgent):
+    """BaseAgent whose ADK run is replaced by a script of per-attempt behaviours"""
+
+    def __init__(self, script):
+        super().__init__()
+        self.script = list(script)
+        self.session_ids = []
+
+    async def _run_with_adk(self, prompt, session_id, user_id, **kwargs):
+        self.session_ids.append(session_id)
+        return await self.script.pop(0)()
+
+
+async def _hang():
+    await asyncio.Event().wait()
+
+
+def _slow(text, delay=0.05):
+    async def run():
+        await asyncio.sleep(delay)
+        return text
+    return run
+
+
+def _reply(text):
+    async def run():
+        return text
+    return run
+
+
+async def _overloaded():
+    raise RuntimeError("503 UNAVAILABLE: the model is overloaded")
+
+
+class GenerateResponseTimeoutTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.service = FakeSessionService()
+        patches = [
+            mock.patch.object(base, "_INITIALIZED", True),
+            mock.patch.object(base, "_shared_session_service", self.service),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_session_bound_call_is_not_cut_off_by_timeout(self):
+        agent = ScriptedAgent([_slow("QUESTION: Tell me more.")])
+
+        result = await agent.generate_response(
+            "answer", session_id="run-1", user_id="user-1", request_timeout=0.01
+        )
+
+        self.assertEqual(result, "QUESTION: Tell me more.")
+        # One run only - the user turn ADK already wrote is never re-sent
+        self.assertEqual(agent.session_ids, ["run-1"])
+
+    async def test_session_less_timeout_retries_on_a_fresh_session(self):
+        agent = ScriptedAgent([_hang, _reply("summary")])
+
+        with mock.patch("asyncio.sleep", mock.AsyncMock()):
+            result = await agent.generate_response("summarize", request_timeout=0.01)
+
+        self.assertEqual(result, "summary")
+        self.assertEqual(len(agent.session_ids), 2)
+        self.assertNotEqual(agent.session_ids[0], agent.session_ids[1])
+        # Both throwaway sessions are deleted
+        self.assertEqual(self.service.deleted, agent.session_ids)
+
+    async def test_session_bound_overload_is_retried(self):
+        agent = ScriptedAgent([_overloaded, _reply("QUESTION: Next one.")])
+
+        with mock.patch("asyncio.sleep", mock.AsyncMock()):
+            result = await agent.generate_response("answer", session_id="run-1", user_id="user-1")
+
+        self.assertEqual(result, "QUESTION: Next one.")
+        self.assertEqual(agent.session_ids, ["run-1", "run-1"])
+
+
+class FlakySessionService(FakeSessionService):
+    """No sessions exist; the first create_session call fails"""
+
+    def __init__(self):
+        super().__init__()
+        self.creates = 0
+
+    async def get_session(self, app_name, user_id, session_id):
+        return None
+
+    async def create_session(self, app_name, user_id, session_id=None, state=None):
+        self.creates += 1
+        if self.creates == 1:
+            raise RuntimeError("session store unavailable")
+        return object()
+
+
+class EnsureSessionExistsTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.service = FlakySessionService()
+        patches = [
+            mock.patch.object(base, "_INITIALIZED", True),
+            mock.patch.object(base, "_shared_session_service", self.service),
+            mock.patch.object(base, "_CREATE_SESSION_PARAMS", frozenset({"session_id", "state"})),
+            mock.patch.object(base, "_known_sessions", base.OrderedDict()),
+            mock.patch.object(base, "_session_create_locks", base.defaultdict(asyncio.Lock)),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_failed_create_drops_its_lock(self):
+        agent = ScriptedAgent([])
+
+        self.assertFalse(await agent._ensure_session_exists("run-1", "user-1"))
+        self.assertEqual(len(base._session_create_locks), 0)
+
+        # The next call retries the create and remembers the session
+        self.assertTrue(await agent._ensure_session_exists("run-1", "user-1"))
+        self.assertEqual(len(base._session_create_locks), 0)
+        self.assertEqual(self.service.creates, 2)
+
+    async def test_known_sessions_are_bounded(self):
+        agent = ScriptedAgent([])
+        self.service.creates = 1  # Skip the scripted failure
+
+        with mock.patch.object(base, "MAX_KNOWN_SESSIONS", 2):
+            for run in ("run-1", "run-2", "run-3"):
+                await agent._ensure_session_exists(run, "user-1")
+
+        self.assertEqual([key[2] for key in base._known_sessions], ["run-2", "run-3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+"""
+CoordinatorAgent QUESTION:/FEEDBACK: response parsing
+"""
+import unittest
+
+from src.agents.coordinator import CoordinatorAgent
+
+parse = CoordinatorAgent._parse_question_feedback
+
+
+class ParseQuestionFeedbackTest(unittest.TestCase):
+
+    def test_labelled_question_and_feedback(self):
+        self.assertEqual(
+            parse("QUESTION: How did you scale it?\nFEEDBACK: Clear answer."),
+            ("How did you scale it?", "Clear answer.")
+        )
+
+    def test_preamble_before_label_is_dropped(self):
+        self.assertEqual(
+            parse("Sure! Here's the next one.\nQUESTION: Why Postgres?\nFEEDBACK: Good detail on indexing."),
+            ("Why Postgres?", "Good detail on indexing.")
+        )
+
+    def test_preamble_without_feedback(self):
+        self.assertEqual(parse("Sure! QUESTION: Any questions for me?"), ("Any questions for me?", None))
+
+    def test_unlabelled_response_is_the_question(self):
+        self.assertEqual(parse("Tell me about yourself."), ("Tell me about yourself.", None))
+
+
+if __name__ == "__main__":
+    unittest.main()